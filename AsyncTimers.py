@@ -0,0 +1,92 @@
+import asyncio
+import time
+from Deadline import remaining_seconds, advance_deadline
+
+# asyncio-native countdowns for console tools and services. Thousands of
+# countdowns share one event loop: each waits with asyncio.sleep until its
+# next whole-second edge, computed from an absolute loop.time() deadline so
+# sleep overshoot never accumulates. Cancel a countdown by cancelling the
+# task that awaits it.
+
+
+def ticks(seconds, loop_forever=False):
+    # async iterator of remaining whole seconds: seconds, ..., 1, 0
+    # with loop_forever it starts over after each 0
+    # checked here, at the call, not on the first iteration; the same rules
+    # as TimerCore.Timer
+    if loop_forever and seconds <= 0:
+        raise ValueError("a looping countdown needs a positive number of seconds")
+    if seconds < 0:
+        raise ValueError("countdown seconds cannot be negative")
+    return _ticks(seconds, loop_forever)
+
+
+async def _ticks(seconds, loop_forever):
+    clock = asyncio.get_running_loop().time
+    now = clock()
+    deadline = now + seconds
+    last = None
+    while True:
+        left = remaining_seconds(deadline, now)
+        if left != last:
+            last = left
+            yield left
+        if left == 0:
+            if not loop_forever:
+                return
+            deadline = advance_deadline(deadline, seconds, clock())
+            last = None
+        else:
+            # sleep to the next edge of the deadline
+            await asyncio.sleep(max(0.0, deadline - (left - 1) - clock()))
+        now = clock()
+
+
+async def countdown(seconds, on_tick=None):
+    # wait `seconds`, optionally calling on_tick(seconds_left) every second
+    async for left in ticks(seconds):
+        if on_tick is not None:
+            on_tick(left)
+
+
+async def firings(next_fire, wall_clock=time.time, wall_check=1.0):
+    # async iterator over schedule firings. next_fire(after) returns the next
+    # wall-clock epoch strictly after `after`, or None when the schedule ends.
+    # Yields the epoch each firing was due at. Firings missed while the
+    # consumer was busy, or across a suspend or a clock step, are coalesced
+    # into one: the next due time is taken from now, not from the last one.
+    due = next_fire(wall_clock())
+    while due is not None:
+        # sleep in bounded slices and re-check the wall clock, so a clock
+        # step or a suspend delays the firing by at most wall_check
+        while True:
+            delay = due - wall_clock()
+            if delay <= 0:
+                break
+            await asyncio.sleep(min(delay, wall_check))
+        yield due
+        due = next_fire(max(due, wall_clock()))
+
+
+def daily(hhmm):
+    # next_fire function for a daily "HH:MM" start in local time
+    hour, minute = (int(part) for part in hhmm.split(":"))
+
+    def next_fire(after):
+        t = time.localtime(after)
+        due = time.mktime((t.tm_year, t.tm_mon, t.tm_mday, hour, minute, 0, 0, 0, -1))
+        day = 0
+        while due <= after:
+            day += 1
+            due = time.mktime((t.tm_year, t.tm_mon, t.tm_mday + day, hour, minute, 0, 0, 0, -1))
+        return due
+
+    return next_fire
+
+
+def every(seconds):
+    # next_fire function for a fixed interval, aligned to the epoch
+    def next_fire(after):
+        return (after // seconds + 1) * seconds
+
+    return next_fire
@@ -0,0 +1,131 @@
+import collections
+import queue
+import threading
+import time
+from Metrics import get_metrics
+
+# One long-lived thread that plays every beep, fed through a bounded queue.
+#
+# Merging: a request for a sound that is already queued, or that started
+# playing less than merge_window seconds ago, is folded into that one -
+# ten timers beeping on the same second edge make one beep.
+# Full queue: the new request is dropped and counted. The queue only fills
+# when the audio device stalls, and a late beep is worse than a missing one.
+# Control work (opening the mixer, preloading sounds) goes through control()
+# instead: an unbounded FIFO that is never merged or dropped and runs ahead
+# of any queued beep.
+
+SOUND_LATENCY = get_metrics().histogram(
+    "sound_latency_seconds", "From a sound being requested to play() returning")
+SOUND_ERRORS = get_metrics().counter("sound_errors_total", "Sounds that failed to play")
+SOUND_DROPPED = get_metrics().counter("sound_dropped_total", "Sound requests dropped on a full queue")
+
+
+class AudioWorker:
+    def __init__(self, play=None, maxsize=8, merge_window=0.25, clock=time.monotonic):
+        self.play = play
+        self.merge_window = merge_window
+        self.clock = clock
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.pending = set()
+        self.last_played = {}  # key -> clock() when it last started, pruned after merge_window
+        self.controls = collections.deque()  # (key, fn) control work, in order
+        self.lock = threading.Lock()
+        self.thread = None
+        self.requested = 0
+        self.played = 0
+        self.merged = 0
+        self.dropped = 0
+        self.controlled = 0
+
+    def _ensure_thread(self):
+        # with self.lock held
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="AudioWorker", daemon=True)
+            self.thread.start()
+
+    def control(self, key, fn):
+        # run fn on the worker before any queued beep; never merged or dropped
+        with self.lock:
+            self.controls.append((key, fn))
+            self._ensure_thread()
+        try:
+            # wake the worker; if the queue is full it is busy and will look
+            # at the controls before its next item anyway
+            self.queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def request(self, key=None, play=None):
+        # `play` overrides the default player for this request, so windows
+        # sharing one worker can each apply their own volume
+        with self.lock:
+            self.requested += 1
+            last = self.last_played.get(key)
+            if key in self.pending or (last is not None and self.clock() - last < self.merge_window):
+                self.merged += 1
+                return False
+            try:
+                self.queue.put_nowait((key, play or self.play, self.clock()))
+            except queue.Full:
+                self.dropped += 1
+                SOUND_DROPPED.inc()
+                return False
+            self.pending.add(key)
+            self._ensure_thread()
+        return True
+
+    def stop(self):
+        thread = self.thread
+        if thread is not None:
+            # a sentinel that skips the merge/drop bookkeeping
+            self.queue.put(self)
+            thread.join()
+            self.thread = None
+
+    def stats(self):
+        with self.lock:
+            return {
+                "requested": self.requested,
+                "played": self.played,
+                "merged": self.merged,
+                "dropped": self.dropped,
+                "controls": self.controlled,
+                "queued": self.queue.qsize(),
+            }
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            self._run_controls()
+            if item is self:
+                return
+            if item is None:  # a control() wake-up
+                continue
+            key, play, requested_at = item
+            with self.lock:
+                self.pending.discard(key)
+                now = self.clock()
+                # only keys inside the merge window matter
+                for old in [k for k, t in self.last_played.items() if now - t >= self.merge_window]:
+                    del self.last_played[old]
+                self.last_played[key] = now
+                self.played += 1
+            try:
+                play()
+                SOUND_LATENCY.observe(self.clock() - requested_at)
+            except Exception as e:
+                SOUND_ERRORS.inc()
+                print(f"Sound error: {e}")
+
+    def _run_controls(self):
+        while True:
+            with self.lock:
+                if not self.controls:
+                    return
+                key, fn = self.controls.popleft()
+                self.controlled += 1
+            try:
+                fn()
+            except Exception as e:
+                print(f"Audio control error ({key}): {e}")
@@ -0,0 +1,141 @@
+import heapq
+import itertools
+import time
+from datetime import datetime
+
+# One clock abstraction for the timer and scheduler code: monotonic time,
+# wall time, sleep and callback scheduling. SystemClock is the real thing;
+# VirtualClock is a single-threaded stand-in whose time only moves when
+# advance() is called, so a 24-hour schedule can be replayed in milliseconds.
+#
+# VirtualClock doubles as every scheduler the engine needs: call_at/cancel
+# (what a Timer ticks on, like TimingWheel) and schedule_at/reschedule/cancel
+# plus schedule_wall/reschedule_wall (what a Schedule arms, like
+# ScheduleDispatcher). Callbacks run inside advance(), in deadline order, with
+# the clock set to their deadline. step_wall() re-anchors wall-clock jobs the
+# way the dispatcher does after an NTP step or a suspend.
+
+
+class SystemClock:
+    def monotonic(self):
+        return time.monotonic()
+
+    def time(self):
+        return time.time()
+
+    def now(self, tz=None):
+        return datetime.now(tz)
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+SYSTEM_CLOCK = SystemClock()
+
+
+class VirtualClock:
+    def __init__(self, monotonic=0.0, wall=None):
+        self.mono = monotonic
+        # wall time is kept as an offset from monotonic time, so it advances
+        # with it and can be stepped on its own (NTP, suspend)
+        self.wall_offset = (time.time() if wall is None else wall) - monotonic
+        self.heap = []      # [deadline, seq, job_id, callback, args, active, wall epoch or None]
+        self.entries = {}   # job_id -> live heap entry
+        self.ids = itertools.count(1)
+        self.seq = itertools.count()
+        self.fired = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    # -- time --
+
+    def monotonic(self):
+        return self.mono
+
+    def time(self):
+        return self.mono + self.wall_offset
+
+    def now(self, tz=None):
+        return datetime.fromtimestamp(self.time(), tz)
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def step_wall(self, seconds):
+        # move wall time only, as an NTP step or a suspend would
+        self.wall_offset += seconds
+        for entry in [e for e in self.entries.values() if e[6] is not None]:
+            entry[5] = False
+            self._push(entry[2], entry[6] - self.wall_offset, entry[3], entry[4], entry[6])
+
+    def suspend(self, seconds):
+        # the machine sleeps: wall time moves on, monotonic time does not
+        self.step_wall(seconds)
+
+    # -- scheduling --
+
+    def call_at(self, deadline, callback, *args):
+        job_id = next(self.ids)
+        self._push(job_id, deadline, callback, args)
+        return job_id
+
+    def schedule_wall(self, epoch, callback, *args):
+        job_id = next(self.ids)
+        self._push(job_id, epoch - self.wall_offset, callback, args, epoch)
+        return job_id
+
+    def _push(self, job_id, deadline, callback, args, wall=None):
+        entry = [deadline, next(self.seq), job_id, callback, args, True, wall]
+        self.entries[job_id] = entry
+        heapq.heappush(self.heap, entry)
+
+    def call_later(self, delay, callback, *args):
+        return self.call_at(self.mono + delay, callback, *args)
+
+    schedule_at = call_at
+    schedule = call_later
+
+    def cancel(self, job_id):
+        entry = self.entries.pop(job_id, None)
+        if entry is None:
+            return False
+        entry[5] = False
+        return True
+
+    def reschedule(self, job_id, deadline):
+        entry = self.entries.pop(job_id, None)
+        if entry is None:
+            return False
+        entry[5] = False
+        self._push(job_id, deadline, entry[3], entry[4])
+        return True
+
+    def reschedule_wall(self, job_id, epoch):
+        entry = self.entries.pop(job_id, None)
+        if entry is None:
+            return False
+        entry[5] = False
+        self._push(job_id, epoch - self.wall_offset, entry[3], entry[4], epoch)
+        return True
+
+    # -- driving --
+
+    def advance(self, seconds):
+        self.run_until(self.mono + seconds)
+
+    def run_until(self, deadline):
+        # fire everything due up to `deadline`, including callbacks scheduled
+        # by callbacks, then leave the clock at `deadline`
+        heap = self.heap
+        while heap and heap[0][0] <= deadline:
+            entry = heapq.heappop(heap)
+            if not entry[5]:
+                continue
+            del self.entries[entry[2]]
+            if entry[0] > self.mono:
+                self.mono = entry[0]
+            self.fired += 1
+            entry[3](*entry[4])
+        if deadline > self.mono:
+            self.mono = deadline
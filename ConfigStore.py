@@ -0,0 +1,300 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from Metrics import get_metrics
+from ScheduleDispatcher import get_dispatcher
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# In-memory settings loaded once from a JSON file shared by every timer
+# instance. The file holds one named profile per timer:
+#
+#     {"profiles": {"default": {...}, "Station 2": {...}}}
+#
+# One store serves every timer window in a process; each window talks to it
+# through a ProfileView. Setters only mark (profile, key) pairs dirty; the
+# file is rewritten after `delay` seconds without further changes (at most
+# `max_delay` after the first unsaved change). A write takes an advisory lock,
+# re-reads the file only if its mtime or size moved, merges the dirty keys
+# into it and replaces it through a temp file, so concurrent instances
+# neither lose each other's updates nor leave a truncated config behind.
+#
+# Reads pick up other instances' changes: at most every `refresh_interval`
+# seconds a get() stat()s the file and re-reads it only if it moved. A write
+# that fails is retried with a doubling backoff (up to MAX_RETRY seconds)
+# until one succeeds.
+
+CONFIG_WRITES = get_metrics().counter("config_writes_total", "Config file rewrites")
+CONFIG_WRITE_ERRORS = get_metrics().counter("config_write_errors_total", "Config saves that failed")
+MAX_RETRY = 60.0
+
+
+class FileLock:
+    # advisory exclusive lock on a side file next to the config
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+
+    def __enter__(self):
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        else:
+            # LK_LOCK retries for ~10 s before giving up
+            msvcrt.locking(self.fd, msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self.fd, 0, os.SEEK_SET)
+                msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self.fd)
+            self.fd = None
+
+
+class ConfigStore:
+    def __init__(self, path, profile="default", template="default", delay=0.5, max_delay=5.0,
+                 dispatcher=None, refresh_interval=1.0):
+        self.path = path
+        self.profile = profile
+        self.template = template
+        self.delay = delay
+        self.max_delay = max_delay
+        self.refresh_interval = refresh_interval
+        self.next_refresh = 0.0
+        self.retry_at = None  # monotonic time of the next retry after a failed write
+        self.failures = 0     # failed writes in a row
+        self.dispatcher = dispatcher or get_dispatcher()
+        self.lock = threading.RLock()
+        self.file_lock = FileLock(path + ".lock")
+        self.doc = {"profiles": {}}
+        self.data = {}
+        self.signature = None  # (mtime_ns, size, inode) of the file we last parsed
+        self.dirty_keys = set()  # {(profile, key)}
+        self.first_dirty = None
+        self.flush_job = None
+        # counters
+        self.reads = 0
+        self.reloads_skipped = 0
+        self.writes = 0
+        self.sets = 0
+        self.unchanged = 0
+        self.write_errors = 0
+        self.load()
+
+    @property
+    def dirty(self):
+        return bool(self.dirty_keys)
+
+    def load(self):
+        with self.lock:
+            self.doc = self.read_file()
+            self.data = self.profile_of(self.doc, self.profile)
+            self.dirty_keys.clear()
+            return self.data
+
+    def maybe_refresh(self):
+        # with self.lock held; refresh() at most every refresh_interval
+        now = time.monotonic()
+        if now >= self.next_refresh:
+            self.next_refresh = now + self.refresh_interval
+            self.refresh()
+
+    def refresh(self):
+        # pick up changes other instances made; a stat() when nothing moved
+        with self.lock:
+            if self.file_signature() == self.signature:
+                self.reloads_skipped += 1
+                return False
+            self.merge_file(self.read_file())
+            return True
+
+    def file_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        # the inode changes on every os.replace, even within one mtime tick
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def read_file(self):
+        self.signature = self.file_signature()
+        if self.signature is None:
+            return {"profiles": {}}
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self.reads += 1
+        except Exception as e:
+            print("Failed to load config:", e)
+            return {"profiles": {}}
+        if not isinstance(data, dict):
+            return {"profiles": {}}
+        if not isinstance(data.get("profiles"), dict):
+            # single-timer file from before profiles: it becomes one profile
+            data = {"profiles": {data.get("name", "default"): data}}
+        return data
+
+    def profile_of(self, doc, name):
+        profiles = doc["profiles"]
+        if name not in profiles:
+            # a new timer starts from the template profile's settings
+            seed = dict(profiles.get(self.template, {}))
+            seed["name"] = name
+            profiles[name] = seed
+        return profiles[name]
+
+    def merge_file(self, doc):
+        # keep our unsaved keys on top of whatever is on disk now
+        for name, key in self.dirty_keys:
+            self.profile_of(doc, name)[key] = self.doc["profiles"][name][key]
+        self.doc = doc
+        self.data = self.profile_of(doc, self.profile)
+
+    def profiles(self):
+        with self.lock:
+            self.maybe_refresh()
+            return sorted(self.doc["profiles"])
+
+    def view(self, name):
+        with self.lock:
+            self.profile_of(self.doc, name)
+        return ProfileView(self, name)
+
+    def get(self, key, default=None, profile=None):
+        with self.lock:
+            self.maybe_refresh()
+            return self.profile_of(self.doc, profile or self.profile).get(key, default)
+
+    def set(self, key, value, profile=None):
+        self.update({key: value}, profile)
+
+    def update(self, values, profile=None):
+        name = profile or self.profile
+        with self.lock:
+            self.sets += 1
+            data = self.profile_of(self.doc, name)
+            changed = {k: v for k, v in values.items() if data.get(k, self) != v}
+            if not changed:
+                self.unchanged += 1
+                return
+            data.update(changed)
+            self.mark_dirty((name, key) for key in changed)
+
+    def update_profiles(self, profiles):
+        # {name: {key: value}} for many timers at once: one lock, one
+        # debounced write
+        with self.lock:
+            self.sets += 1
+            dirty = []
+            for name, values in profiles.items():
+                data = self.profile_of(self.doc, name)
+                for key, value in values.items():
+                    if data.get(key, self) != value:
+                        data[key] = value
+                        dirty.append((name, key))
+            if not dirty:
+                self.unchanged += 1
+                return 0
+            self.mark_dirty(dirty)
+            return len(dirty)
+
+    def mark_dirty(self, keys):
+        now = time.monotonic()
+        if not self.dirty_keys:
+            self.first_dirty = now
+        self.dirty_keys.update(keys)
+        # debounce: push the write back on every change, but not forever
+        when = min(now + self.delay, self.first_dirty + self.max_delay)
+        if self.retry_at is not None:
+            when = max(when, self.retry_at)  # don't cut a failure backoff short
+        if self.flush_job is None or not self.dispatcher.reschedule(self.flush_job, when):
+            self.flush_job = self.dispatcher.schedule_at(when, self.flush)
+
+    def flush(self):
+        with self.lock:
+            if self.flush_job is not None:
+                self.dispatcher.cancel(self.flush_job)
+                self.flush_job = None
+            if not self.dirty_keys:
+                return False
+            try:
+                with self.file_lock:
+                    if self.file_signature() != self.signature:
+                        self.merge_file(self.read_file())
+                    else:
+                        self.reloads_skipped += 1
+                    self.write_file(self.doc)
+                    self.signature = self.file_signature()
+            except Exception as e:
+                self.write_errors += 1
+                CONFIG_WRITE_ERRORS.inc()
+                print("Failed to save config:", e)
+                self.failures += 1
+                backoff = min(self.delay * 2 ** self.failures, MAX_RETRY)
+                self.retry_at = time.monotonic() + backoff
+                self.flush_job = self.dispatcher.schedule_at(self.retry_at, self.flush)
+                return False
+            self.dirty_keys.clear()
+            self.failures = 0
+            self.retry_at = None
+            return True
+
+    def write_file(self, data):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".timer_config.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self.writes += 1
+        CONFIG_WRITES.inc()
+
+    def close(self):
+        self.flush()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "reads": self.reads,
+                "reloads_skipped": self.reloads_skipped,
+                "writes": self.writes,
+                "sets": self.sets,
+                "unchanged": self.unchanged,
+                "write_errors": self.write_errors,
+                "dirty": self.dirty,
+            }
+
+
+class ProfileView:
+    # one timer's slice of a shared ConfigStore
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+
+    def get(self, key, default=None):
+        return self.store.get(key, default, self.name)
+
+    def set(self, key, value):
+        self.store.set(key, value, self.name)
+
+    def update(self, values):
+        self.store.update(values, self.name)
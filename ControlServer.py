@@ -0,0 +1,200 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from Metrics import get_metrics
+from TimerControl import TimerController, parse_address
+
+# Local control API for scripts. Newline-delimited JSON over a Unix socket or
+# a localhost TCP port; each line is one command, or a list of commands run
+# as a batch, and gets one line back:
+#
+#     {"op": "create", "name": "Tea", "seconds": 180}      -> {"ok": true, "timer": {...}}
+#     [{"op": "start", "name": "Tea"}, {"op": "list"}]     -> [{"ok": true, ...}, {"ok": true, "timers": [...]}]
+#     {"op": "stop", "name": "Nope"}                       -> {"ok": false, "error": "no timer 'Nope'"}
+#
+# Ops: create, start, stop, pause, resume, reschedule (remaining seconds from
+# now, or "at" a wall-clock epoch), remove and list. Clients may pipeline: send
+# many lines without waiting and read the answers back in order.
+#
+# The commands themselves are TimerController's (TimerControl.py). The
+# server runs its own asyncio loop on a thread and never touches timers
+# itself. Commands are handed to `deliver` (root.after in the app), and
+# everything that arrives while a hand-off is pending joins it, so a burst of
+# thousands of commands costs the GUI thread a few callbacks, not thousands.
+# One hand-off runs at most MAX_HANDOFF commands (a single batch is never
+# split) and hands the rest to a fresh callback, so the GUI thread gets back
+# to its own events between them.
+#
+# Request latency under load is queueing: a client keeping W batches of B
+# commands in flight waits behind about W * B commands, at whatever rate the
+# GUI thread runs them. ControlLoadTest.py (4 clients x 64 batches of 50,
+# some 12,800 commands in flight) sees p99 of a second or two that way,
+# while no GUI callback runs longer than a few tens of ms. A script that
+# keeps fewer requests in flight gets proportionally faster answers.
+
+PORT = 50100
+MAX_LINE = 1 << 20
+MAX_HANDOFF = 1000  # commands per GUI-thread callback
+
+CONTROL_HANDOFF = get_metrics().histogram(
+    "control_handoff_seconds", "Wait between a control request arriving and its batch running")
+
+
+class ControlServer:
+    def __init__(self, controller, address=PORT, deliver=None):
+        # address: a port on 127.0.0.1, (host, port), or a Unix socket path
+        self.controller = controller
+        if isinstance(address, int):
+            address = ("127.0.0.1", address)
+        self.address = address
+        self.deliver = deliver  # None: run commands on the server's own thread
+        self.lock = threading.Lock()
+        self.pending = []       # [(commands, future, arrived)] waiting for the hand-off
+        self.handoff = False    # a drain is scheduled on the target thread
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.ready = threading.Event()
+        self.error = None
+        self.connections = 0
+        self.handoffs = 0
+
+    def start(self):
+        self.thread = threading.Thread(target=self._thread, name="ControlServer", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+
+    def stop(self):
+        if self.loop is not None and self.server is not None:
+            self.loop.call_soon_threadsafe(self.server.close)
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+            self.thread = None
+        if isinstance(self.address, str):
+            try:
+                os.remove(self.address)
+            except OSError:
+                pass
+
+    def _thread(self):
+        try:
+            asyncio.run(self._serve())
+        except Exception as e:
+            print(f"Control server error: {e}")
+
+    async def _serve(self):
+        self.loop = asyncio.get_running_loop()
+        try:
+            if isinstance(self.address, str):
+                if os.path.exists(self.address):
+                    os.remove(self.address)  # left over from a crash
+                self.server = await asyncio.start_unix_server(self._client, self.address, limit=MAX_LINE)
+                os.chmod(self.address, 0o600)
+            else:
+                host, port = self.address
+                self.server = await asyncio.start_server(self._client, host, port, limit=MAX_LINE)
+                self.address = self.server.sockets[0].getsockname()[:2]
+        except (OSError, AttributeError) as e:
+            self.error = e
+            self.ready.set()
+            return
+        self.ready.set()
+        try:
+            await self.server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    async def _client(self, reader, writer):
+        self.connections += 1
+        buffered = b""
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                buffered += data
+                *lines, buffered = buffered.split(b"\n")
+                if len(buffered) > MAX_LINE:
+                    writer.write(b'{"ok": false, "error": "line too long"}\n')
+                    break
+                if lines:
+                    # everything that arrived together goes over in one batch
+                    writer.write(await self._lines(lines))
+                    await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _lines(self, lines):
+        requests = []    # (is batch, slice of commands) per non-empty line
+        commands = []
+        errors = {}
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                errors[len(requests)] = {"ok": False, "error": f"bad JSON: {e}"}
+                requests.append((False, None))
+                continue
+            batch = isinstance(request, list)
+            first = len(commands)
+            commands.extend(request if batch else [request])
+            requests.append((batch, slice(first, len(commands))))
+        results = await self._submit(commands) if commands else []
+        out = []
+        for i, (batch, span) in enumerate(requests):
+            if span is None:
+                response = errors[i]
+            else:
+                response = results[span] if batch else results[span.start]
+            out.append(json.dumps(response))
+        return ("\n".join(out) + "\n").encode() if out else b""
+
+    def _submit(self, commands):
+        future = self.loop.create_future()
+        if self.deliver is None:
+            future.set_result(self.controller.run_batch(commands))
+            return future
+        with self.lock:
+            self.pending.append((commands, future, time.monotonic()))
+            if self.handoff:
+                return future
+            self.handoff = True
+        self.deliver(self._drain)
+        return future
+
+    def _drain(self):
+        # on the target thread: run the batches waiting so far, up to
+        # MAX_HANDOFF commands; the rest go in another hand-off
+        with self.lock:
+            taken = count = 0
+            for commands, _, _ in self.pending:
+                if count and taken + len(commands) > MAX_HANDOFF:
+                    break
+                taken += len(commands)
+                count += 1
+            pending, self.pending = self.pending[:count], self.pending[count:]
+            more = self.handoff = bool(self.pending)
+        self.handoffs += 1
+        now = time.monotonic()
+        for commands, future, arrived in pending:
+            CONTROL_HANDOFF.observe(now - arrived)
+            results = self.controller.run_batch(commands)
+            try:
+                self.loop.call_soon_threadsafe(self._resolve, future, results)
+            except RuntimeError:
+                pass  # the server has shut down
+        if more:
+            self.deliver(self._drain)
+
+    @staticmethod
+    def _resolve(future, results):
+        if not future.done():
+            future.set_result(results)
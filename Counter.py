@@ -1,5 +1,9 @@
+import asyncio
 import time
 from threading import Thread
+from AsyncTimers import ticks, firings, every
+from TerminalDashboard import TerminalDashboard
+from TimeStrings import mmss
 
 def counter(count):
     while count > 0:
@@ -7,7 +11,36 @@ def counter(count):
         time.sleep(1)
         count -= 1
 
+async def async_counter(count):
+    # same output without a thread; many of these can share one event loop
+    async for left in ticks(count):
+        if left:
+            print(f"\rcountdown: {left}",  end="", flush=True)
+
+async def dashboard_counters(counts):
+    # many named countdowns plus the local time, redrawn once per second edge
+    dashboard = TerminalDashboard()
+    dashboard.set("clock", time.strftime("%H:%M:%S"))
+
+    async def one(name, count):
+        async for left in ticks(count):
+            dashboard.set(name, mmss(left))
+
+    tasks = [asyncio.create_task(one(name, count)) for name, count in counts.items()]
+    try:
+        async for due in firings(every(1)):
+            dashboard.set("clock", time.strftime("%H:%M:%S", time.localtime(due)))
+            dashboard.render()
+            if all(task.done() for task in tasks):
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        dashboard.close()
+
 if __name__ == "__main__":
-    myTimer = Thread(target=counter, args=(10,))
-    myTimer.start()
-    myTimer.join()
+    # myTimer = Thread(target=counter, args=(10,))
+    # myTimer.start()
+    # myTimer.join()
+    asyncio.run(async_counter(10))
+    # asyncio.run(dashboard_counters({f"timer {i}": 10 + i for i in range(500)}))
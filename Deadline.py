@@ -0,0 +1,31 @@
+import math
+
+# Helpers for counting down against an absolute time.monotonic() deadline.
+# Remaining time is always derived from the deadline, so callback latency
+# on one tick never carries over into the next.
+
+
+def remaining_seconds(deadline, now):
+    # whole seconds still to show, rounded up so the display flips exactly
+    # on each second edge (10.0 -> 10, 9.999 -> 10, 9.0 -> 9)
+    return max(0, math.ceil(deadline - now))
+
+
+def ms_until_next_edge(deadline, now):
+    # milliseconds until remaining_seconds() drops by one; rounded up so the
+    # callback never lands just before the edge
+    left = deadline - now
+    if left <= 0:
+        return 0
+    delay = left - (math.ceil(left) - 1)
+    return max(1, math.ceil(delay * 1000))
+
+
+def advance_deadline(deadline, period, now):
+    # next loop deadline, anchored to the previous one rather than to "now";
+    # whole periods that were missed (e.g. while suspended) are skipped
+    deadline += period
+    if deadline <= now:
+        missed = math.floor((now - deadline) / period) + 1
+        deadline += missed * period
+    return deadline
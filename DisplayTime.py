@@ -1,12 +1,15 @@
+import asyncio
 import time
 import sys
 from threading import Thread
-import queue
+from AsyncTimers import firings, every
+from LatestValue import LatestValue
 
 class DisplayTime(Thread):
 
     def __init__(self,time_queue):
         super().__init__()
+        # a LatestValue: wakes on every new time and skips any it missed
         self.time_queue = time_queue
 
     def run(self):
@@ -15,8 +18,6 @@ class DisplayTime(Thread):
             if time_str is None:
                 break
             print(f"\r{time_str}", end="", flush=True)
-            time.sleep(1)
-            self.time_queue.task_done()
 
 
 class MyTimer(Thread):
@@ -32,8 +33,7 @@ class MyTimer(Thread):
             # Update the current time and print it dynamically
             current_time = time.strftime("%H:%M:%S")
             self.time_queue.put(current_time)
-            time.sleep(1)  # Wait for 1 second before updating
-            # self.time_queue.task_done()
+            time.sleep(1 - time.time() % 1)  # Wait for the next second edge
 
 def display_time():
     try:
@@ -56,6 +56,11 @@ def display_time_thread():
         print("\nExiting...")
         sys.exit()
 
+async def async_display_time():
+    # redraw on every wall-clock second edge from inside an event loop
+    async for due in firings(every(1)):
+        print(f"\r{time.strftime('%H:%M:%S', time.localtime(due))}", end="", flush=True)
+
 
 if __name__ == "__main__":
     # display_time()
@@ -63,7 +68,7 @@ if __name__ == "__main__":
     # myTimer = Thread(target=display_time_thread)
     # myTimer.start()
     # myTimer.join()
-    my_time_queue = queue.Queue()
+    my_time_queue = LatestValue()
 
     timer = MyTimer(my_time_queue)
     display = DisplayTime(my_time_queue)
@@ -73,11 +78,10 @@ if __name__ == "__main__":
         timer.join()
         display.join()
     except KeyboardInterrupt:
+        my_time_queue.close()
         print("\nExiting...")
         sys.exit()
 
-    my_time_queue.join()
-
 
 
 
@@ -0,0 +1,32 @@
+# Change-only widget updates. The renderer remembers the last text, colour
+# and font it applied to each widget and drops configure() calls that would
+# not change anything, so an unchanged label costs Tk no reconfigure and no
+# re-layout. All updates to a widget should go through the same renderer.
+
+_MISSING = object()
+
+
+class LabelRenderer:
+    def __init__(self):
+        self.state = {}  # widget -> {option: last applied value}
+        self.applied = 0
+        self.skipped = 0
+
+    def render(self, widget, **options):
+        last = self.state.get(widget)
+        if last is None:
+            last = self.state[widget] = {}
+        changed = {k: v for k, v in options.items() if last.get(k, _MISSING) != v}
+        if not changed:
+            self.skipped += 1
+            return False
+        widget.configure(**changed)
+        last.update(changed)
+        self.applied += 1
+        return True
+
+    def forget(self, widget):
+        self.state.pop(widget, None)
+
+    def stats(self):
+        return {"applied": self.applied, "skipped": self.skipped, "widgets": len(self.state)}
@@ -0,0 +1,302 @@
+import select
+import socket
+import struct
+import threading
+from Clock import SYSTEM_CLOCK
+from Metrics import get_metrics
+
+# Countdowns shared across machines on a LAN. One instance is the authority:
+# it multicasts a heartbeat per published timer, once a second and at once on
+# every start, pause, resume or stop. Followers join the group and mirror
+# each heartbeat onto a local Timer of the same name.
+#
+# Every packet is one fixed 60-byte struct; ticks are never sent. A running
+# timer is described by its deadline on the authority's monotonic clock, so
+# followers need only the offset between that clock and their own. They
+# estimate it NTP-style: a ping carries the follower's send time t1, the pong
+# adds the authority's receive and send times t2 and t3, and with the
+# follower's receive time t4
+#
+#     offset = ((t2 - t1) + (t3 - t4)) / 2      delay = (t4 - t1) - (t3 - t2)
+#
+# Of the last few samples the one with the smallest delay wins, as in NTP's
+# clock filter, since queueing only ever adds delay. On a LAN that puts a
+# follower's deadline within a millisecond or so of the authority's; a local
+# timer is only restarted when it is more than `tolerance` away.
+#
+#     authority = LanSync("authority"); authority.start(); authority.publish("Tea", timer)
+#     follower = LanSync("follower", deliver=...); follower.start(); follower.follow("Tea", timer)
+
+GROUP = "239.255.42.99"
+PORT = 50099
+MAGIC = b"TMRS"
+VERSION = 1
+HEARTBEAT, PING, PONG = 1, 2, 3
+RUNNING, PAUSED, LOOP, FINISHED = 1, 2, 4, 8
+# magic, version, kind, name, seq, seconds, flags, a, b, c
+#   HEARTBEAT: a = sent, b = deadline (running or finished) or seconds left (paused)
+#   PING:      a = t1                 PONG: a = t1, b = t2, c = t3
+PACKET = struct.Struct("!4sBBxx16sIIIddd")
+NAME_BYTES = 16
+SAMPLES = 8
+
+SYNC_PACKETS = get_metrics().counter("sync_packets_total", "LAN sync packets sent and received")
+SYNC_ROUND_TRIP = get_metrics().histogram("sync_round_trip_seconds", "LAN sync ping round-trip delay")
+
+
+def pack(kind, name="", seq=0, seconds=0, flags=0, a=0.0, b=0.0, c=0.0):
+    raw = name.encode("utf-8")[:NAME_BYTES]
+    return PACKET.pack(MAGIC, VERSION, kind, raw, seq, seconds, flags, a, b, c)
+
+
+def unpack(data):
+    # (kind, name, seq, seconds, flags, a, b, c), or None for anything else
+    if len(data) != PACKET.size:
+        return None
+    magic, version, kind, raw, seq, seconds, flags, a, b, c = PACKET.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        return None
+    name = raw.rstrip(b"\0").decode("utf-8", "ignore")
+    return kind, name, seq, seconds, flags, a, b, c
+
+
+def sync_name(name):
+    # names travel in a 16-byte field; followers match on the same cut
+    return name.encode("utf-8")[:NAME_BYTES].decode("utf-8", "ignore")
+
+
+class LanSync:
+    def __init__(self, role, group=GROUP, port=PORT, interface="0.0.0.0", deliver=None, clock=None,
+                 interval=1.0, ping_interval=1.0, tolerance=0.005, resolve=None):
+        if role not in ("authority", "follower"):
+            raise ValueError(f"unknown sync role: {role}")
+        self.role = role
+        self.group = group
+        self.port = port
+        self.interface = interface
+        self.deliver = deliver or (lambda fn: fn())
+        self.clock = SYSTEM_CLOCK if clock is None else clock
+        self.interval = interval            # authority: heartbeat period
+        self.ping_interval = ping_interval  # follower: offset sampling period
+        self.tolerance = tolerance
+        self.resolve = resolve              # follower: name -> Timer for names not followed yet
+        self.timers = {}                    # name -> Timer
+        self.seqs = {}                      # authority: name -> last heartbeat seq
+        self.last = {}                      # follower: name -> (seq, sent) of the last heartbeat applied
+        self.pending = {}                   # follower: name -> heartbeat waiting for a first offset
+        self.samples = []                   # follower: [(delay, offset)]
+        self.offset = None                  # authority clock minus ours
+        self.delay = None
+        self.authority = None               # follower: authority's unicast address
+        self.sock = None
+        self.group_sock = None
+        self.lock = threading.Lock()
+        self.thread = None
+        self.running = False
+        self.sent = 0
+        self.received = 0
+
+    # -- sockets --
+
+    def start(self):
+        # unicast socket: authority heartbeats and pongs go out on it, a
+        # follower's pings and pongs; the group socket only hears heartbeats
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((self.interface, 0))
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+        if self.interface != "0.0.0.0":
+            self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(self.interface))
+        if self.role == "follower":
+            self.group_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.group_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if hasattr(socket, "SO_REUSEPORT"):
+                self.group_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            self.group_sock.bind(("", self.port))
+            membership = struct.pack("4s4s", socket.inet_aton(self.group), socket.inet_aton(self.interface))
+            self.group_sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name=f"LanSync-{self.role}", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=2 * max(self.interval, self.ping_interval))
+            self.thread = None
+        for sock in (self.sock, self.group_sock):
+            if sock is not None:
+                sock.close()
+        self.sock = self.group_sock = None
+
+    def _send(self, data, address):
+        try:
+            self.sock.sendto(data, address)
+        except (OSError, AttributeError) as e:
+            print(f"Sync send error: {e}")
+            return
+        self.sent += 1
+        SYNC_PACKETS.inc()
+
+    def _run(self):
+        sockets = [s for s in (self.sock, self.group_sock) if s is not None]
+        next_send = self.clock.monotonic()
+        # a follower samples quickly at first so it syncs within a second
+        burst = 4 if self.role == "follower" else 0
+        while self.running:
+            now = self.clock.monotonic()
+            if now >= next_send:
+                if self.role == "authority":
+                    self.announce_all()
+                    next_send = now + self.interval
+                else:
+                    sent = self.ping()
+                    next_send = now + (0.05 if burst else self.ping_interval)
+                    if sent and burst:
+                        burst -= 1
+            try:
+                ready, _, _ = select.select(sockets, [], [], max(0.0, min(next_send - now, 0.25)))
+            except (OSError, ValueError):
+                return
+            for sock in ready:
+                try:
+                    data, address = sock.recvfrom(PACKET.size + 1)
+                except OSError:
+                    continue
+                received = self.clock.monotonic()
+                packet = unpack(data)
+                if packet is None:
+                    continue
+                self.received += 1
+                SYNC_PACKETS.inc()
+                try:
+                    self._handle(packet, address, received)
+                except Exception as e:
+                    print(f"Sync error: {e}")
+
+    def _handle(self, packet, address, received):
+        kind, name, seq, seconds, flags, a, b, c = packet
+        if self.role == "authority":
+            if kind == PING:
+                self._send(pack(PONG, seq=seq, a=a, b=received, c=self.clock.monotonic()), address)
+        elif kind == PONG:
+            self._sample(a, b, c, received)
+        elif kind == HEARTBEAT:
+            if address != self.authority:
+                # a new (or restarted) authority: its clock is a new one
+                self.authority = address
+                with self.lock:
+                    self.samples = []
+                    self.offset = None
+                    self.last = {}
+                self.ping()
+            self._heartbeat(name, seq, seconds, flags, a, b)
+
+    # -- authority --
+
+    def publish(self, name, timer):
+        # announce every state change of `timer` as `name`
+        name = sync_name(name)
+        self.timers[name] = timer
+        for event in ("start", "pause", "resume", "stop", "finish", "loop"):
+            timer.on(event, lambda *args: self.announce(name))
+        self.announce(name)
+
+    def unpublish(self, name):
+        self.timers.pop(sync_name(name), None)
+
+    def announce(self, name):
+        timer = self.timers.get(name)
+        if timer is None or self.sock is None:
+            return
+        flags = LOOP if timer.loop else 0
+        value = 0.0
+        if timer.running:
+            flags |= RUNNING
+            value = timer.deadline
+        elif timer.paused:
+            flags |= PAUSED
+            value = timer.remaining
+        elif timer.deadline is not None and timer.deadline <= self.clock.monotonic():
+            # ran out rather than being stopped early
+            flags |= FINISHED
+            value = timer.deadline
+        seq = self.seqs.get(name, 0) + 1
+        self.seqs[name] = seq
+        self._send(pack(HEARTBEAT, name, seq, int(timer.seconds), flags, self.clock.monotonic(), value),
+                   (self.group, self.port))
+
+    def announce_all(self):
+        for name in list(self.timers):
+            self.announce(name)
+
+    # -- follower --
+
+    def follow(self, name, timer):
+        self.timers[sync_name(name)] = timer
+
+    def ping(self):
+        if self.authority is None:
+            return False
+        self._send(pack(PING, a=self.clock.monotonic()), self.authority)
+        return True
+
+    def _sample(self, t1, t2, t3, t4):
+        delay = (t4 - t1) - (t3 - t2)
+        if delay < 0:
+            return
+        SYNC_ROUND_TRIP.observe(delay)
+        with self.lock:
+            self.samples.append((delay, ((t2 - t1) + (t3 - t4)) / 2))
+            del self.samples[:-SAMPLES]
+            first = self.offset is None
+            self.delay, self.offset = min(self.samples)
+            pending, self.pending = self.pending, {}
+        if first:
+            for heartbeat in pending.values():
+                self._heartbeat(*heartbeat)
+
+    def _heartbeat(self, name, seq, seconds, flags, sent, value):
+        with self.lock:
+            if self.offset is None:
+                self.pending[name] = (name, seq, seconds, flags, sent, value)
+                return
+            last = self.last.get(name)
+            if last is not None and sent <= last[1]:
+                return  # reordered or duplicated
+            self.last[name] = (seq, sent)
+            offset = self.offset
+        self.deliver(lambda: self._apply(name, seconds, flags, value, offset))
+
+    def _apply(self, name, seconds, flags, value, offset):
+        # runs wherever `deliver` puts it (the Tk thread in the app)
+        timer = self.timers.get(name)
+        if timer is None and self.resolve is not None:
+            timer = self.resolve(name)
+            if timer is not None:
+                self.timers[name] = timer
+        if timer is None:
+            return
+        timer.loop = bool(flags & LOOP)
+        if flags & RUNNING:
+            deadline = value - offset
+            if (timer.running and timer.seconds == seconds
+                    and abs(timer.deadline - deadline) <= self.tolerance):
+                return
+            timer.seconds = seconds
+            timer.start(now=deadline - seconds)
+        elif flags & PAUSED:
+            if timer.paused and timer.seconds == seconds and abs(timer.remaining - value) <= self.tolerance:
+                return
+            timer.seconds = seconds
+            timer.start(now=self.clock.monotonic() + value - seconds)
+            timer.pause()
+        elif flags & FINISHED and timer.running and abs(timer.deadline - (value - offset)) <= 1.0:
+            return  # about to run out here too; let it finish (and ring) on its own
+        elif timer.running or timer.paused:
+            timer.stop()
+
+    def stats(self):
+        with self.lock:
+            return {"role": self.role, "offset": self.offset, "delay": self.delay, "samples": len(self.samples),
+                    "sent": self.sent, "received": self.received, "timers": len(self.timers)}
@@ -0,0 +1,52 @@
+import threading
+
+# A one-slot channel between a producer and a consumer that only cares about
+# the newest value (a clock display, a progress readout). put() never blocks
+# and overwrites whatever the consumer has not taken yet; get() blocks until
+# there is a value it has not seen. Memory is one slot however far the
+# consumer falls behind, and what it gets is always the freshest value.
+
+
+class LatestValue:
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.value = None
+        self.version = 0     # bumped by every put
+        self.taken = 0       # version the consumer last took
+        self.closed = False
+        self.puts = 0
+        self.gets = 0
+        self.dropped = 0     # values overwritten before anyone took them
+
+    def put(self, value):
+        with self.cond:
+            if self.closed:
+                return False
+            if self.version != self.taken:
+                self.dropped += 1
+            self.value = value
+            self.version += 1
+            self.puts += 1
+            self.cond.notify()
+        return True
+
+    def get(self, timeout=None):
+        # the newest unseen value; None once closed and drained, or on timeout
+        with self.cond:
+            if not self.cond.wait_for(lambda: self.version != self.taken or self.closed, timeout):
+                return None
+            if self.version == self.taken:
+                return None  # closed
+            self.taken = self.version
+            self.gets += 1
+            return self.value
+
+    def close(self):
+        # wake the consumer; a value already put is still delivered first
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+    def stats(self):
+        with self.cond:
+            return {"puts": self.puts, "gets": self.gets, "dropped": self.dropped}
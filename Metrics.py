@@ -0,0 +1,265 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+
+# In-process metrics for timer and UI health. Recording is a bisect and two
+# additions under a lock, cheap enough for every tick; gauges that mirror an
+# existing count (pending schedules) are read only when exported.
+# MetricsExporter rewrites a JSON file, or Prometheus text format for a
+# ".prom" path, every few seconds:
+#
+#     exporter = MetricsExporter(get_metrics(), "timer_metrics.prom")
+#     exporter.start()
+
+# seconds; covers "on time" through "visibly late"
+LATENCY_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help=""):
+        self.name = name
+        self.help = help
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def snapshot(self):
+        return {"value": self.value}
+
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name, help="", fn=None):
+        self.name = name
+        self.help = help
+        self.fn = fn  # read the value from elsewhere at export time
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def snapshot(self):
+        if self.fn is not None:
+            try:
+                return {"value": self.fn()}
+            except Exception as e:
+                print(f"Metrics gauge error: {e}")
+                return {"value": None}
+        return {"value": self.value}
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help="", buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)  # last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect_left(self.bounds, value)
+        with self.lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q, counts=None, count=None):
+        # upper bound of the bucket holding the q-th observation
+        counts = self.counts if counts is None else counts
+        count = self.count if count is None else count
+        if not count:
+            return None
+        rank = q * count
+        seen = 0
+        for bound, n in zip(self.bounds, counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def snapshot(self):
+        with self.lock:
+            counts = list(self.counts)
+            total, count, largest = self.sum, self.count, self.max
+        cumulative = []
+        seen = 0
+        for n in counts:
+            seen += n
+            cumulative.append(seen)
+        return {
+            "count": count,
+            "sum": total,
+            "max": largest,
+            "p50": self.quantile(0.5, counts, count),
+            "p99": self.quantile(0.99, counts, count),
+            "buckets": dict(zip([str(b) for b in self.bounds] + ["+Inf"], cumulative)),
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = {}  # name -> metric, in registration order
+        self.lock = threading.Lock()
+
+    def _get(self, cls, name, *args, **kwargs):
+        # modules register their metrics at import; asking twice returns the
+        # same object
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name, help=""):
+        return self._get(Counter, name, help)
+
+    def gauge(self, name, help="", fn=None):
+        gauge = self._get(Gauge, name, help)
+        if fn is not None:
+            gauge.fn = fn
+        return gauge
+
+    def histogram(self, name, help="", buckets=LATENCY_BUCKETS):
+        return self._get(Histogram, name, help, buckets)
+
+    def snapshot(self):
+        with self.lock:
+            metrics = list(self.metrics.values())
+        return {m.name: dict(type=m.kind, **m.snapshot()) for m in metrics}
+
+    def to_json(self):
+        return json.dumps({"timestamp": time.time(), "metrics": self.snapshot()}, indent=2)
+
+    def to_prometheus(self):
+        lines = []
+        for name, data in self.snapshot().items():
+            metric = self.metrics[name]
+            if metric.help:
+                lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {data['type']}")
+            if data["type"] == "histogram":
+                for bound, n in data["buckets"].items():
+                    lines.append(f'{name}_bucket{{le="{bound}"}} {n}')
+                lines.append(f"{name}_sum {data['sum']}")
+                lines.append(f"{name}_count {data['count']}")
+            elif data["value"] is not None:
+                lines.append(f"{name} {data['value']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        # atomic replace, so a scraper never reads half a file
+        text = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".metrics.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+class MetricsExporter:
+    # rewrites `path` every `interval` seconds from the schedule dispatcher
+    # thread, and once more on stop()
+
+    def __init__(self, registry, path, interval=10.0, dispatcher=None):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self.dispatcher = dispatcher
+        self.job_id = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        if self.dispatcher is None:
+            from ScheduleDispatcher import get_dispatcher
+            self.dispatcher = get_dispatcher()
+        self._write()
+
+    def stop(self):
+        with self.lock:
+            if self.job_id is not None:
+                self.dispatcher.cancel(self.job_id)
+                self.job_id = None
+        self.write()
+
+    def write(self):
+        try:
+            self.registry.write(self.path)
+        except Exception as e:
+            print(f"Metrics write error: {e}")
+
+    def _write(self):
+        self.write()
+        with self.lock:
+            self.job_id = self.dispatcher.schedule(self.interval, self._write)
+
+
+class LagProbe:
+    # event-loop lag: how late a callback asked for `interval` seconds ahead
+    # actually runs. call_later(delay, callback) is the loop's own scheduler,
+    # e.g. lambda d, cb: root.after(int(d * 1000), cb) for Tk or
+    # loop.call_later for asyncio.
+
+    def __init__(self, call_later, histogram, interval=1.0, clock=time.monotonic):
+        self.call_later = call_later
+        self.histogram = histogram
+        self.interval = interval
+        self.clock = clock
+        self.due = None
+        self.running = False
+
+    def start(self):
+        self.running = True
+        self._arm()
+
+    def stop(self):
+        self.running = False
+
+    def _arm(self):
+        self.due = self.clock() + self.interval
+        self.call_later(self.interval, self._fire)
+
+    def _fire(self):
+        if not self.running:
+            return
+        # Tk rounds after() to whole milliseconds, so a wake may be a hair early
+        self.histogram.observe(max(0.0, self.clock() - self.due))
+        self._arm()
+
+
+_metrics = MetricsRegistry()
+
+
+def get_metrics():
+    # the registry shared by every module in this process
+    return _metrics
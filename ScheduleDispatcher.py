@@ -0,0 +1,232 @@
+import heapq
+import itertools
+import threading
+import time
+from Metrics import get_metrics
+
+# One thread for every pending scheduled start in the process. Pending starts
+# live in a heap ordered by deadline; the thread sleeps on a condition
+# variable until the earliest one is due and is woken straight away when a
+# start is added, cancelled or rescheduled.
+#
+# Wall-clock starts (schedule_wall) are anchored to an absolute epoch, not to
+# a delay. The heap still orders them by a monotonic deadline, derived from
+# the current wall-minus-monotonic offset. While any are pending the thread
+# wakes at least every `wall_check` seconds and re-reads that offset. A
+# suspend (monotonic time stops, wall time does not) or an NTP step moves the
+# offset, and every wall-clock start is then re-anchored at once: overdue
+# ones fire immediately, the rest keep their epoch. Once the earliest
+# wall-clock start is less than `wall_check` away the thread re-reads the
+# offset every NEAR_CHECK seconds instead, so a step in that last stretch
+# moves the firing by at most NEAR_CHECK. A step made further out that
+# jumps straight past a target is still seen within wall_check.
+
+FIRE_LATENESS = get_metrics().histogram(
+    "schedule_fire_lateness_seconds", "How late scheduled starts ran after their deadline")
+CLOCK_JUMPS = get_metrics().counter(
+    "clock_jumps_total", "Wall-clock steps or suspends that re-anchored scheduled starts")
+# offset changes below this are measurement noise or NTP slewing
+JUMP_TOLERANCE = 0.002
+NEAR_CHECK = 0.01
+
+
+class ScheduleDispatcher:
+    def __init__(self, clock=time.monotonic, wall_clock=time.time, wall_check=1.0):
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.wall_check = wall_check
+        self.heap = []      # [deadline, seq, job_id, callback, args, active, wall epoch or None]
+        self.entries = {}   # job_id -> live heap entry
+        self.dead = 0       # cancelled entries still sitting in the heap
+        self.wall_jobs = 0  # live entries anchored to the wall clock
+        self.wall_heap = [] # the same wall-clock entries alone, stale ones skipped lazily
+        self.offset = self.wall_clock() - self.clock()
+        self.jumps = 0
+        self.ids = itertools.count(1)
+        self.seq = itertools.count()
+        self.cond = threading.Condition()
+        self.thread = None
+        self.running = False
+
+    def __len__(self):
+        return len(self.entries)
+
+    def schedule_at(self, deadline, callback, *args):
+        with self.cond:
+            job_id = next(self.ids)
+            self._push(job_id, deadline, callback, args)
+            self._ensure_thread()
+            self.cond.notify()
+        return job_id
+
+    def schedule(self, delay, callback, *args):
+        return self.schedule_at(self.clock() + delay, callback, *args)
+
+    def schedule_wall(self, epoch, callback, *args):
+        # run at wall-clock time `epoch`, whatever the clock does meanwhile
+        with self.cond:
+            self._check_offset()
+            job_id = next(self.ids)
+            self._push(job_id, epoch - self.offset, callback, args, epoch)
+            self._ensure_thread()
+            self.cond.notify()
+        return job_id
+
+    def reschedule_wall(self, job_id, epoch):
+        with self.cond:
+            entry = self.entries.pop(job_id, None)
+            if entry is None:
+                return False
+            self._kill(entry)
+            self._check_offset()
+            self._push(job_id, epoch - self.offset, entry[3], entry[4], epoch)
+            self.cond.notify()
+        return True
+
+    def cancel(self, job_id):
+        with self.cond:
+            entry = self.entries.pop(job_id, None)
+            if entry is None:
+                return False
+            self._kill(entry)
+            self.cond.notify()
+        return True
+
+    def reschedule(self, job_id, deadline):
+        with self.cond:
+            entry = self.entries.pop(job_id, None)
+            if entry is None:
+                return False
+            self._kill(entry)
+            self._push(job_id, deadline, entry[3], entry[4])
+            self.cond.notify()
+        return True
+
+    def deadline_of(self, job_id):
+        with self.cond:
+            entry = self.entries.get(job_id)
+            return entry[0] if entry else None
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.thread = None
+
+    def _push(self, job_id, deadline, callback, args, wall=None):
+        entry = [deadline, next(self.seq), job_id, callback, args, True, wall]
+        self.entries[job_id] = entry
+        heapq.heappush(self.heap, entry)
+        if wall is not None:
+            self.wall_jobs += 1
+            heapq.heappush(self.wall_heap, entry)
+
+    def _kill(self, entry):
+        # lazy deletion; rebuild the heap once it is mostly dead entries
+        entry[5] = False
+        if entry[6] is not None:
+            self.wall_jobs -= 1
+        self.dead += 1
+        if self.dead > 64 and self.dead > len(self.heap) // 2:
+            self.heap = [e for e in self.heap if e[5]]
+            heapq.heapify(self.heap)
+            self.wall_heap = [e for e in self.heap if e[6] is not None]
+            heapq.heapify(self.wall_heap)
+            self.dead = 0
+
+    def _ensure_thread(self):
+        if not self.running:
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name="ScheduleDispatcher", daemon=True)
+            self.thread.start()
+
+    def _check_offset(self):
+        # re-anchor wall-clock jobs if wall time moved against monotonic time
+        offset = self.wall_clock() - self.clock()
+        if abs(offset - self.offset) <= JUMP_TOLERANCE:
+            return False
+        self.offset = offset
+        if self.wall_jobs:
+            self.jumps += 1
+            CLOCK_JUMPS.inc()
+            for entry in [e for e in self.entries.values() if e[6] is not None]:
+                del self.entries[entry[2]]
+                self._kill(entry)
+                self._push(entry[2], entry[6] - offset, entry[3], entry[4], entry[6])
+        return True
+
+    def _next_wall(self):
+        # monotonic deadline of the earliest pending wall-clock start
+        heap = self.wall_heap
+        while heap and self.entries.get(heap[0][2]) is not heap[0]:
+            heapq.heappop(heap)  # cancelled, re-anchored or already fired
+        return heap[0][0] if heap else None
+
+    def _pop_due(self, now):
+        due = []
+        heap = self.heap
+        while heap and (not heap[0][5] or heap[0][0] <= now):
+            entry = heapq.heappop(heap)
+            if not entry[5]:
+                self.dead -= 1
+                continue
+            del self.entries[entry[2]]
+            if entry[6] is not None:
+                self.wall_jobs -= 1
+            due.append(entry)
+        return due
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while True:
+                    if not self.running:
+                        return
+                    if self.wall_jobs:
+                        self._check_offset()
+                    due = self._pop_due(self.clock())
+                    if due:
+                        break
+                    if self.heap:
+                        now = self.clock()
+                        timeout = self.heap[0][0] - now
+                        if self.wall_jobs:
+                            # bounded, so a clock jump is seen within wall_check,
+                            # and within NEAR_CHECK close to a wall-clock target
+                            wall_left = self._next_wall() - now
+                            if wall_left < self.wall_check:
+                                timeout = min(timeout, NEAR_CHECK)
+                            else:
+                                # and wake when the near stretch begins
+                                timeout = min(timeout, self.wall_check,
+                                              max(NEAR_CHECK, wall_left - self.wall_check))
+                        self.cond.wait(timeout)
+                    else:
+                        self.cond.wait()
+            # run callbacks outside the lock so they may schedule or cancel
+            now = self.clock()
+            for entry in due:
+                FIRE_LATENESS.observe(max(0.0, now - entry[0]))
+                try:
+                    entry[3](*entry[4])
+                except Exception as e:
+                    print(f"Scheduled start error: {e}")
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    # the dispatcher shared by every timer in this process
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = ScheduleDispatcher()
+            # every job: scheduled starts, config saves, ... (the rules
+            # themselves are "schedules_pending", from the RuleScheduler)
+            get_metrics().gauge("dispatcher_jobs", "Jobs waiting in the shared dispatcher",
+                                fn=_dispatcher.__len__)
+        return _dispatcher
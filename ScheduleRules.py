@@ -0,0 +1,348 @@
+import heapq
+import itertools
+import time
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from TimerCore import Schedule
+
+# Recurring start rules and an index of their next firings.
+#
+# A rule maps a wall-clock epoch to its next firing strictly after it:
+#
+#     DailyRule(["06:30"], weekdays="mon-fri")
+#     IntervalRule(15 * 60)
+#     CronRule("*/10 8-17 * * 1-5")
+#
+# Every rule takes `exclude`, a collection of dates (date objects or
+# "YYYY-MM-DD") on which it never fires, and `tz`, a time zone name. Times are
+# in that zone, or local time without one; days are walked with pytz or
+# mktime(tm_isdst=-1), so DST nights neither skip nor double a day. A firing
+# is an absolute epoch, which RuleScheduler arms as a wall-clock start.
+# Rules are also plain next_fire(after) callables, as AsyncTimers.firings
+# expects.
+#
+# RuleIndex keeps the next firing of every rule in one heap: the earliest
+# across thousands of rules is a peek, and each firing costs one rule lookup
+# plus an O(log n) push. RuleScheduler arms a single Schedule on the shared
+# dispatcher for the earliest firing and re-arms after each one.
+
+DAY_NAMES = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+DAY_GROUPS = {"daily": "mon-sun", "weekdays": "mon-fri", "weekends": "sat,sun"}
+# how far ahead to look for a day a rule can fire on (covers Feb 29)
+SEARCH_DAYS = 366 * 8
+
+
+def parse_days(text):
+    # "mon-fri", "sat,sun", "weekdays" -> set of weekday numbers (Monday 0)
+    text = DAY_GROUPS.get(text.strip().lower(), text.strip().lower())
+    days = set()
+    for part in text.split(","):
+        if "-" in part:
+            first, last = (DAY_NAMES[p.strip()[:3]] for p in part.split("-"))
+            day = first
+            days.add(day)
+            while day != last:
+                day = (day + 1) % 7
+                days.add(day)
+        elif part.strip():
+            days.add(DAY_NAMES[part.strip()[:3]])
+    return days
+
+
+def parse_hhmm(text):
+    hour, minute = (int(part) for part in text.strip().split(":"))
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"time out of range: {text}")
+    return hour * 60 + minute
+
+
+def local_epoch(day, minute_of_day, zone=None):
+    # wall-clock epoch of a date and minute in `zone` (a pytz zone, or local
+    # time); a time skipped by DST comes out shifted past the gap
+    hour, minute = divmod(minute_of_day, 60)
+    if zone is None:
+        return time.mktime((day.year, day.month, day.day, hour, minute, 0, 0, 0, -1))
+    naive = datetime(day.year, day.month, day.day, hour, minute)
+    return zone.normalize(zone.localize(naive, is_dst=False)).timestamp()
+
+
+def local_time(epoch, zone=None):
+    # (date, minute of day) of an epoch in `zone`
+    if zone is None:
+        t = time.localtime(epoch)
+        return date(t.tm_year, t.tm_mon, t.tm_mday), t.tm_hour * 60 + t.tm_min
+    t = datetime.fromtimestamp(epoch, zone)
+    return t.date(), t.hour * 60 + t.minute
+
+
+def local_date(epoch, zone=None):
+    return local_time(epoch, zone)[0]
+
+
+def next_local(after, minutes, day_ok, zone=None):
+    # first (day, minute) firing strictly after `after`, trying the sorted
+    # `minutes` of each day accepted by day_ok
+    day, minute_now = local_time(after, zone)
+    first = bisect_left(minutes, minute_now)
+    for _ in range(SEARCH_DAYS):
+        if day_ok(day):
+            for minute in minutes[first:]:
+                due = local_epoch(day, minute, zone)
+                if due > after:
+                    return due
+        day += timedelta(days=1)
+        first = 0
+    return None
+
+
+class Rule:
+    def __init__(self, exclude=(), tz=None):
+        self.exclude = {d if isinstance(d, date) else date.fromisoformat(d) for d in exclude}
+        self.tz = tz
+        self.zone = None
+        if tz:
+            from ZoneClock import get_zone
+            try:
+                self.zone = get_zone(tz)
+            except Exception:
+                raise ValueError(f"unknown time zone: {tz}")
+
+    def __call__(self, after):
+        return self.next_fire(after)
+
+    def next_fire(self, after):
+        due = self.next_after(after)
+        while due is not None and self.exclude and local_date(due, self.zone) in self.exclude:
+            # skip the whole excluded day, not one firing at a time
+            day = local_date(due, self.zone) + timedelta(days=1)
+            due = self.next_after(local_epoch(day, 0, self.zone) - 1)
+        return due
+
+    def next_after(self, after):
+        raise NotImplementedError
+
+
+class DailyRule(Rule):
+    def __init__(self, times, weekdays=None, exclude=(), tz=None):
+        super().__init__(exclude, tz)
+        if isinstance(times, str):
+            times = times.split(",")
+        self.minutes = sorted({parse_hhmm(t) for t in times})
+        if isinstance(weekdays, str):
+            weekdays = parse_days(weekdays)
+        self.weekdays = set(range(7)) if weekdays is None else set(weekdays)
+        if not self.minutes or not self.weekdays:
+            raise ValueError("a daily rule needs at least one time and one weekday")
+
+    def next_after(self, after):
+        return next_local(after, self.minutes, lambda day: day.weekday() in self.weekdays, self.zone)
+
+
+class IntervalRule(Rule):
+    # every `seconds`, aligned to `anchor` (default: the epoch, so 15
+    # minutes fires at :00, :15, :30, :45 in whole-hour zones)
+
+    def __init__(self, seconds, anchor=0.0, exclude=(), tz=None):
+        super().__init__(exclude, tz)
+        if seconds <= 0:
+            raise ValueError("interval must be positive")
+        self.seconds = seconds
+        self.anchor = anchor
+
+    def next_after(self, after):
+        return self.anchor + ((after - self.anchor) // self.seconds + 1) * self.seconds
+
+
+class CronRule(Rule):
+    # standard five-field cron: minute hour day-of-month month day-of-week,
+    # with *, lists, ranges and /steps; day-of-week 0 or 7 is Sunday. As in
+    # cron, when both day fields are restricted a day matching either fires.
+    FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression, exclude=(), tz=None):
+        super().__init__(exclude, tz)
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"cron needs 5 fields: {expression!r}")
+        self.expression = expression
+        fields = [self.parse_field(p, lo, hi) for p, (lo, hi) in zip(parts, self.FIELDS)]
+        minutes, hours, self.days, self.months, weekdays = fields
+        self.minutes = sorted(h * 60 + m for h in hours for m in minutes)
+        # cron Sunday is 0 or 7, Python's is 6
+        self.weekdays = {(d - 1) % 7 for d in weekdays}
+        self.any_day = parts[2] == "*"
+        self.any_weekday = parts[4] == "*"
+
+    @staticmethod
+    def parse_field(text, lo, hi):
+        values = set()
+        for part in text.split(","):
+            step = 1
+            if "/" in part:
+                part, step = part.split("/")
+                step = int(step)
+            if part == "*":
+                first, last = lo, hi
+            elif "-" in part:
+                first, last = (int(p) for p in part.split("-"))
+            else:
+                first = last = int(part)
+                if step != 1:
+                    last = hi
+            if not (lo <= first <= last <= hi) or step < 1:
+                raise ValueError(f"bad cron field: {text!r}")
+            values.update(range(first, last + 1, step))
+        return values
+
+    def day_ok(self, day):
+        if day.month not in self.months:
+            return False
+        by_date = day.day in self.days
+        by_weekday = day.weekday() in self.weekdays
+        if self.any_day:
+            return by_weekday
+        if self.any_weekday:
+            return by_date
+        return by_date or by_weekday
+
+    def next_after(self, after):
+        return next_local(after, self.minutes, self.day_ok, self.zone)
+
+
+def parse_rule(text, exclude=(), tz=None):
+    # "06:30", "06:30,18:00 mon-fri", "every 15m", "*/10 8-17 * * 1-5"
+    text = text.strip()
+    words = text.split()
+    if len(words) == 5:
+        return CronRule(text, exclude, tz)
+    if words and words[0].lower() == "every":
+        amount = "".join(words[1:]).lower()
+        units = {"s": 1, "m": 60, "h": 3600}
+        if amount and amount[-1] in units:
+            return IntervalRule(float(amount[:-1]) * units[amount[-1]], exclude=exclude, tz=tz)
+        return IntervalRule(float(amount) * 60, exclude=exclude, tz=tz)
+    if 1 <= len(words) <= 2:
+        try:
+            return DailyRule(words[0], words[1] if len(words) == 2 else None, exclude, tz)
+        except KeyError as e:
+            raise ValueError(f"unknown day {e}")
+    raise ValueError(f"unrecognised schedule: {text!r}")
+
+
+class RuleIndex:
+    # next firing of every rule, earliest first. Entries are
+    # [fire, seq, rule_id, active]; removed rules are dropped lazily like
+    # ScheduleDispatcher's cancelled jobs.
+
+    def __init__(self):
+        self.heap = []
+        self.rules = {}     # rule_id -> (rule, payload, live entry or None)
+        self.dead = 0
+        self.ids = itertools.count(1)
+        self.seq = itertools.count()
+
+    def __len__(self):
+        return len(self.rules)
+
+    def add(self, rule, payload=None, after=None):
+        rule_id = next(self.ids)
+        self.rules[rule_id] = (rule, payload, None)
+        self._push(rule_id, rule.next_fire(time.time() if after is None else after))
+        return rule_id
+
+    def remove(self, rule_id):
+        entry = self.rules.pop(rule_id, None)
+        if entry is None:
+            return False
+        if entry[2] is not None:
+            entry[2][3] = False
+            self.dead += 1
+            if self.dead > 64 and self.dead > len(self.heap) // 2:
+                self.heap = [e for e in self.heap if e[3]]
+                heapq.heapify(self.heap)
+                self.dead = 0
+        return True
+
+    def next_fire(self):
+        heap = self.heap
+        while heap and not heap[0][3]:
+            heapq.heappop(heap)
+            self.dead -= 1
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now):
+        # [(fire, rule_id, payload)] due at `now`, each rule re-indexed at its
+        # following firing
+        due = []
+        while True:
+            fire = self.next_fire()
+            if fire is None or fire > now:
+                return due
+            entry = heapq.heappop(self.heap)
+            rule_id = entry[2]
+            rule, payload, _ = self.rules[rule_id]
+            due.append((fire, rule_id, payload))
+            # a firing missed by more than one period is not replayed
+            self._push(rule_id, rule.next_fire(max(fire, now)))
+
+    def _push(self, rule_id, fire):
+        rule, payload, _ = self.rules[rule_id]
+        if fire is None:  # the rule has no more firings
+            self.rules[rule_id] = (rule, payload, None)
+            return
+        entry = [fire, next(self.seq), rule_id, True]
+        self.rules[rule_id] = (rule, payload, entry)
+        heapq.heappush(self.heap, entry)
+
+
+class RuleScheduler:
+    # calls callback(fire_epoch) for every firing of every added rule, using
+    # one Schedule armed for the earliest. `deliver` and `dispatcher` are as
+    # for Schedule; callbacks run wherever "fire" is delivered.
+
+    def __init__(self, dispatcher=None, deliver=None, clock=None):
+        self.index = RuleIndex()
+        self.schedule = Schedule(dispatcher, deliver, clock)
+        self.clock = self.schedule.clock
+        self.schedule.on("fire", self._fire)
+        self.armed = None  # wall-clock firing the schedule is armed for
+        self.fires = 0
+
+    def __len__(self):
+        return len(self.index)
+
+    def add(self, rule, callback):
+        rule_id = self.index.add(rule, callback, self.clock.time())
+        self._arm()
+        return rule_id
+
+    def remove(self, rule_id):
+        if self.index.remove(rule_id):
+            self._arm()
+            return True
+        return False
+
+    def next_fire(self, rule_id=None):
+        if rule_id is None:
+            return self.index.next_fire()
+        entry = self.index.rules.get(rule_id)
+        return entry[2][0] if entry and entry[2] else None
+
+    def _arm(self):
+        fire = self.index.next_fire()
+        if fire is None:
+            self.armed = None
+            self.schedule.cancel()
+        elif fire != self.armed or not self.schedule.pending:
+            self.armed = fire
+            self.schedule.start_at_wall(fire)
+
+    def _fire(self):
+        self.armed = None
+        for fire, rule_id, callback in self.index.pop_due(self.clock.time()):
+            self.fires += 1
+            try:
+                callback(fire)
+            except Exception as e:
+                print(f"Schedule rule error: {e}")
+        self._arm()
@@ -0,0 +1,89 @@
+import os
+import threading
+from collections import OrderedDict
+
+# Decoded pygame Sound objects, keyed by path and mtime so an edited file is
+# decoded again. Least recently used sounds are evicted once the decoded
+# size goes over max_bytes.
+# pygame is imported on first use, so creating a cache costs nothing at
+# startup.
+
+
+class SoundCache:
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.sounds = OrderedDict()  # (path, mtime_ns) -> (sound, size)
+        self.keys = {}               # path -> current key
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, path):
+        key = (path, os.stat(path).st_mtime_ns)
+        with self.lock:
+            entry = self.sounds.get(key)
+            if entry is not None:
+                self.sounds.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # decode outside the lock so a slow file does not block other sounds
+        import pygame
+        sound = pygame.mixer.Sound(path)
+        size = self.sound_size(sound, path)
+        with self.lock:
+            old_key = self.keys.get(path)
+            if old_key is not None and old_key != key:
+                self._drop(old_key)
+            if key not in self.sounds:
+                self.sounds[key] = (sound, size)
+                self.keys[path] = key
+                self.total_bytes += size
+            # keep at least the sound just loaded, even if it is over the cap
+            while self.total_bytes > self.max_bytes and len(self.sounds) > 1:
+                self._drop(next(iter(self.sounds)))
+                self.evictions += 1
+        return sound
+
+    def preload(self, path):
+        try:
+            self.get(path)
+            return True
+        except Exception as e:
+            print(f"Sound preload error: {e}")
+            return False
+
+    def clear(self):
+        with self.lock:
+            self.sounds.clear()
+            self.keys.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.sounds),
+                "bytes": self.total_bytes,
+            }
+
+    def _drop(self, key):
+        _, size = self.sounds.pop(key)
+        self.total_bytes -= size
+        if self.keys.get(key[0]) == key:
+            del self.keys[key[0]]
+
+    @staticmethod
+    def sound_size(sound, path):
+        # decoded PCM size; fall back to the file size if the mixer is not up
+        import pygame
+        init = pygame.mixer.get_init()
+        if init:
+            frequency, sample_format, channels = init
+            return int(sound.get_length() * frequency * channels * (abs(sample_format) // 8))
+        return os.path.getsize(path)
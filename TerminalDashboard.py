@@ -0,0 +1,131 @@
+import shutil
+import sys
+
+# Many named countdowns and clocks in one terminal. Cells are laid out in
+# columns that fit the terminal width; each frame compares every cell with
+# what is already on screen and only rewrites the characters that changed,
+# using ANSI cursor moves, in one buffered write. 500 countdowns ticking once
+# a second cost one write per frame, not 500 prints.
+#
+#     dashboard = TerminalDashboard()
+#     dashboard.set("tea", "03:00")
+#     dashboard.render()
+#     ...
+#     dashboard.close()
+
+CSI = "\x1b["
+HIDE_CURSOR = CSI + "?25l"
+SHOW_CURSOR = CSI + "?25h"
+CLEAR = CSI + "H" + CSI + "2J"
+
+
+def move(row, column):
+    # 1-based screen position
+    return f"{CSI}{row};{column}H"
+
+
+class TerminalDashboard:
+    def __init__(self, out=None, size=None, value_width=8, gap=2):
+        self.out = out or sys.stdout
+        self.size = size            # (columns, rows); None follows the terminal
+        self.value_width = value_width
+        self.gap = gap
+        self.order = []             # cell names in display order
+        self.values = {}            # name -> current text
+        self.shown = {}             # name -> text on screen
+        self.layout = None
+        self.positions = {}         # name -> (row, value column) while visible
+        self.started = False
+        self.frames = 0
+        self.bytes_written = 0
+
+    def set(self, name, text):
+        if name not in self.values:
+            self.order.append(name)
+        self.values[name] = text
+
+    def remove(self, name):
+        if name in self.values:
+            del self.values[name]
+            self.order.remove(name)
+            self.layout = None  # cells move up; redraw everything
+
+    def terminal_size(self):
+        if self.size is not None:
+            return self.size
+        size = shutil.get_terminal_size()
+        return size.columns, size.lines
+
+    def compute_layout(self):
+        # (cell count, name width, cell width, columns, visible rows)
+        width, height = self.terminal_size()
+        name_width = min(max((len(n) for n in self.order), default=1), 24)
+        cell_width = name_width + 1 + self.value_width + self.gap
+        columns = max(1, width // cell_width)
+        rows = max(1, height - 1)  # the last line is the status line
+        return len(self.order), name_width, cell_width, columns, rows
+
+    def render(self):
+        # draw the frame; returns the number of bytes written
+        layout = self.compute_layout()
+        parts = []
+        if layout != self.layout:
+            self._full_frame(layout, parts)
+        else:
+            width = self.value_width
+            for name, (row, column) in self.positions.items():
+                text = self.values[name]
+                old = self.shown[name]
+                if old != text:
+                    self.shown[name] = text
+                    # rewrite from the first character that differs; a
+                    # countdown usually changes only its last digit
+                    new = text.rjust(width)[:width]
+                    old = old.rjust(width)[:width]
+                    i = 0
+                    while i < width and old[i] == new[i]:
+                        i += 1
+                    if i < width:
+                        parts.append(move(row, column + i) + new[i:])
+        if not parts:
+            return 0
+        frame = "".join(parts)
+        self.out.write(frame)
+        self.out.flush()
+        self.frames += 1
+        self.bytes_written += len(frame)
+        return len(frame)
+
+    def _full_frame(self, layout, parts):
+        count, name_width, cell_width, columns, rows = layout
+        self.layout = layout
+        self.positions = {}
+        self.shown = {}
+        if not self.started:
+            self.started = True
+            parts.append(HIDE_CURSOR)
+        parts.append(CLEAR)
+        visible = min(count, columns * rows)
+        for i, name in enumerate(self.order[:visible]):
+            # fill column by column, like ls
+            row = i % rows + 1
+            column = i // rows * cell_width + 1
+            text = self.values[name]
+            value_column = column + name_width + 1
+            self.positions[name] = (row, value_column)
+            self.shown[name] = text
+            parts.append(move(row, column) + name[:name_width].ljust(name_width) + " "
+                         + text.rjust(self.value_width)[:self.value_width])
+        if visible < count:
+            parts.append(move(rows + 1, 1) + f"... {count - visible} more (enlarge the terminal)")
+
+    def close(self):
+        # leave the cursor below the dashboard
+        if self.started:
+            rows = self.layout[4] if self.layout else 1
+            self.out.write(move(rows + 1, 1) + SHOW_CURSOR + "\n")
+            self.out.flush()
+            self.started = False
+
+    def stats(self):
+        return {"cells": len(self.order), "frames": self.frames, "bytes": self.bytes_written}
@@ -0,0 +1,20 @@
+# Precomputed display strings, so rendering a time on every tick is a table
+# lookup instead of a strftime or f-string.
+
+HH_MM = [f"{h:02d}:{m:02d}" for h in range(24) for m in range(60)]
+MM = [f"{m:02d}" for m in range(100)]
+COLON_SS = [f":{s:02d}" for s in range(60)]
+
+
+def hhmmss(seconds_of_day):
+    # "HH:MM:SS" for 0 <= seconds_of_day < 86400
+    minutes, seconds = divmod(seconds_of_day, 60)
+    return HH_MM[minutes] + COLON_SS[seconds]
+
+
+def mmss(seconds):
+    # countdown "MM:SS"; minutes keep growing past 99 like the old f-string
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 100:
+        return MM[minutes] + COLON_SS[seconds]
+    return f"{minutes:02d}" + COLON_SS[seconds]
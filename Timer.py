@@ -1,7 +1,9 @@
 import tkinter as tk
 from tkinter import ttk
-from datetime import datetime
-import pytz
+import time
+from ZoneClock import ZoneClockTable
+from ZoneSearch import get_index
+from LabelRenderer import LabelRenderer
 
 class TimezoneClockApp(tk.Tk):
     def __init__(self):
@@ -12,7 +14,9 @@ class TimezoneClockApp(tk.Tk):
         # Dropdown for timezone selection
         self.timezone_var = tk.StringVar()
         self.timezone_dropdown = ttk.Combobox(self, textvariable=self.timezone_var)
-        self.timezone_dropdown['values'] = sorted(pytz.all_timezones)
+        # values are filled from the search index as the user types
+        self.timezone_dropdown.configure(postcommand=self.filter_timezones)
+        self.timezone_dropdown.bind("<KeyRelease>", self.filter_timezones)
         self.timezone_dropdown.pack(pady=10)
 
         # Button to add timezone
@@ -25,11 +29,18 @@ class TimezoneClockApp(tk.Tk):
 
         # Store timezone widgets
         self.clocks = {}  # { tz_name: (frame, label_time) }
+        self.zone_table = ZoneClockTable()
+        self.renderer = LabelRenderer()
 
         self.update_clocks()
 
+    def filter_timezones(self, event=None):
+        if event is not None and event.keysym in ("Up", "Down", "Return", "Escape"):
+            return
+        self.timezone_dropdown['values'] = get_index().search(self.timezone_var.get())
+
     def add_timezone(self):
-        tz = self.timezone_var.get()
+        tz = get_index().resolve(self.timezone_var.get())
         if tz and tz not in self.clocks:
             frame = tk.Frame(self.clock_frame, bd=1, relief="sunken", padx=5, pady=5)
             frame.pack(pady=5, fill="x", padx=10)
@@ -50,19 +61,21 @@ class TimezoneClockApp(tk.Tk):
 
     def remove_timezone(self, tz):
         if tz in self.clocks:
-            frame, _ = self.clocks[tz]
+            frame, label_time = self.clocks[tz]
+            self.renderer.forget(label_time)
             frame.destroy()
             del self.clocks[tz]
+            self.zone_table.remove(tz)
 
     def update_clocks(self):
-        now_utc = datetime.utcnow().replace(tzinfo=pytz.utc)
+        now = int(time.time())
         for tz_name, (frame, label_time) in self.clocks.items():
             try:
-                local_time = now_utc.astimezone(pytz.timezone(tz_name))
-                label_time.config(text=local_time.strftime("%H:%M:%S"))
+                self.renderer.render(label_time, text=self.zone_table.time_str(tz_name, now))
             except Exception as e:
-                label_time.config(text="Error")
-        self.after(1000, self.update_clocks)
+                self.renderer.render(label_time, text="Error")
+        # re-arm on the next wall-clock second edge
+        self.after(1000 - int(time.time() * 1000) % 1000, self.update_clocks)
 
 if __name__ == "__main__":
     app = TimezoneClockApp()
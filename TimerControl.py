@@ -0,0 +1,162 @@
+import math
+import os
+from Clock import SYSTEM_CLOCK
+from Metrics import get_metrics
+from TimerCore import Timer
+
+# The control API's commands, apart from the asyncio server in
+# ControlServer.py, so the app can define its controller without loading
+# asyncio unless --control is given. A command is a dict with an "op"; see
+# ControlServer.py for the wire format.
+
+CONTROL_COMMANDS = get_metrics().counter("control_commands_total", "Commands run through the control API")
+
+
+def parse_address(text):
+    # "/tmp/timers.sock" -> a Unix socket; "7777" or "127.0.0.1:7777" -> TCP
+    if os.sep in text or text.endswith(".sock"):
+        return text
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+class TimerController:
+    # the commands, run on whichever thread owns the timers; subclasses map
+    # names onto their own timers by overriding get/create/delete/names, and
+    # starting() to prepare a timer the API is about to start
+    OPS = ("create", "start", "stop", "pause", "resume", "reschedule", "remove", "list")
+
+    def __init__(self, scheduler=None, clock=None):
+        self.scheduler = scheduler
+        self.clock = SYSTEM_CLOCK if clock is None else clock
+        self.timers = {}
+
+    def get(self, name):
+        return self.timers.get(name)
+
+    def create(self, name, seconds, loop):
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = Timer(seconds, self.scheduler, loop=loop, name=name, clock=self.clock)
+        else:
+            timer.seconds = seconds
+            timer.loop = loop
+        return timer
+
+    def delete(self, name):
+        timer = self.timers.pop(name, None)
+        if timer is not None:
+            timer.stop()
+        return timer is not None
+
+    def names(self):
+        return list(self.timers)
+
+    def starting(self, name):
+        pass
+
+    def run(self, command):
+        # one command -> one response dict; never raises
+        try:
+            if not isinstance(command, dict):
+                raise ValueError("a command is a JSON object")
+            op = command.get("op")
+            if op not in self.OPS:
+                raise ValueError(f"unknown op {op!r}")
+            return dict(ok=True, **getattr(self, "op_" + op)(command))
+        except (ValueError, TypeError, KeyError, OverflowError) as e:
+            return {"ok": False, "error": str(e)}
+        except Exception as e:
+            print(f"Control command error: {e}")
+            return {"ok": False, "error": str(e)}
+
+    def run_batch(self, commands):
+        CONTROL_COMMANDS.inc(len(commands))
+        return [self.run(command) for command in commands]
+
+    @staticmethod
+    def seconds(command):
+        seconds = int(command["seconds"])
+        if seconds <= 0:
+            raise ValueError("seconds must be positive")
+        return seconds
+
+    def timer(self, command):
+        name = command["name"]
+        timer = self.get(name)
+        if timer is None:
+            raise ValueError(f"no timer {name!r}")
+        return timer
+
+    def state(self, name, timer):
+        if timer.running:
+            state, left = "running", max(0.0, timer.deadline - self.clock.monotonic())
+        elif timer.paused:
+            state, left = "paused", timer.remaining
+        else:
+            state, left = "stopped", None
+        return {"name": name, "seconds": timer.seconds, "loop": timer.loop, "state": state, "remaining": left}
+
+    # -- ops --
+
+    def op_create(self, command):
+        timer = self.create(command["name"], self.seconds(command), bool(command.get("loop", False)))
+        if command.get("start"):
+            self.starting(command["name"])
+            timer.start()
+        return {"timer": self.state(command["name"], timer)}
+
+    def op_start(self, command):
+        timer = self.timer(command)
+        if "seconds" in command:
+            timer.seconds = self.seconds(command)
+        self.starting(command["name"])
+        timer.start()
+        return {"timer": self.state(command["name"], timer)}
+
+    def op_stop(self, command):
+        timer = self.timer(command)
+        timer.stop()
+        return {"timer": self.state(command["name"], timer)}
+
+    def op_pause(self, command):
+        timer = self.timer(command)
+        timer.pause()
+        return {"timer": self.state(command["name"], timer)}
+
+    def op_resume(self, command):
+        timer = self.timer(command)
+        timer.resume()
+        return {"timer": self.state(command["name"], timer)}
+
+    def op_reschedule(self, command):
+        # move when the countdown ends: "remaining" seconds from now, or "at"
+        # a wall-clock epoch; a stopped timer is started to end then
+        timer = self.timer(command)
+        if "at" in command:
+            remaining = float(command["at"]) - self.clock.time()
+        else:
+            remaining = float(command["remaining"])
+        if not math.isfinite(remaining):
+            raise ValueError("the end time must be a finite number")
+        if remaining < 0:
+            raise ValueError("cannot end in the past")
+        if timer.paused:
+            timer.remaining = remaining
+        else:
+            self.starting(command["name"])
+            timer.start(now=self.clock.monotonic() + remaining - timer.seconds)
+        return {"timer": self.state(command["name"], timer)}
+
+    def op_remove(self, command):
+        if not self.delete(command["name"]):
+            raise ValueError(f"no timer {command['name']!r}")
+        return {}
+
+    def op_list(self, command):
+        timers = []
+        for name in self.names():
+            timer = self.get(name)
+            if timer is not None:
+                timers.append(self.state(name, timer))
+        return {"timers": timers}
@@ -0,0 +1,269 @@
+from Clock import SYSTEM_CLOCK
+from Deadline import remaining_seconds, advance_deadline
+from Metrics import get_metrics
+from ScheduleDispatcher import get_dispatcher
+
+# Headless timer engine. Timer and Schedule know nothing about Tk: they emit
+# events and leave rendering, sound and dialogs to whoever subscribes. A
+# Timer needs a scheduler with call_at(deadline, callback) and cancel(handle)
+# - a TimingWheel, a TkWheelDriver, a ThreadWheelDriver or a VirtualClock.
+# Both read time from an injectable clock (Clock.py), so the same code runs
+# in real time or in simulated time.
+#
+# Timer events:
+#     "start"                  the countdown (re)started
+#     "tick"     seconds_left  the displayed whole second changed
+#     "warning"  seconds_left  a tick inside the last `warning` seconds
+#     "expire"                 reached zero (every loop)
+#     "loop"                   restarted for the next loop
+#     "finish"                 reached zero and is not looping
+#     "pause"    remaining     paused with `remaining` seconds (a float) left
+#     "resume"                 counting down again after a pause
+#     "stop"                   stopped before finishing
+#
+# Schedule events:
+#     "scheduled"  deadline    a start was armed or re-armed (monotonic
+#                              deadline, or epoch for start_at_wall)
+#     "fire"                   the start is due
+#     "cancel"                 the pending start was cancelled
+
+TICK_LATENESS = get_metrics().histogram(
+    "timer_tick_lateness_seconds", "How late each timer tick ran after its second edge")
+ACTIVE_TIMERS = get_metrics().gauge("timers_active", "Timers currently counting down")
+
+
+class EventEmitter:
+    def __init__(self):
+        self.listeners = {}
+
+    def on(self, event, callback):
+        self.listeners.setdefault(event, []).append(callback)
+        return callback
+
+    def off(self, event, callback):
+        callbacks = self.listeners.get(event)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+
+    def emit(self, event, *args):
+        for callback in tuple(self.listeners.get(event, ())):
+            callback(*args)
+
+
+class Timer(EventEmitter):
+    def __init__(self, seconds, scheduler, loop=False, warning=10, name=None, clock=None):
+        super().__init__()
+        self.seconds = seconds
+        self.scheduler = scheduler
+        self.loop = loop
+        self.warning = warning
+        self.name = name
+        self.clock = SYSTEM_CLOCK if clock is None else clock
+        self.running = False
+        self.deadline = None
+        self.seconds_left = seconds
+        self.last_shown = None
+        self.handle = None
+        self.wake = None  # the edge the pending tick was scheduled for
+        self.remaining = None  # seconds left while paused
+        self.check()
+
+    def check(self):
+        # a loop period of zero or less would never move the deadline forward
+        if self.loop and self.seconds <= 0:
+            raise ValueError("a looping timer needs a positive number of seconds")
+        if self.seconds < 0:
+            raise ValueError("timer seconds cannot be negative")
+
+    @property
+    def paused(self):
+        return self.remaining is not None
+
+    def start(self, now=None):
+        # an explicit `now` lets a group of timers share one base time
+        self.check()
+        if self.running:
+            self._cancel_tick()
+        if now is None:
+            now = self.clock.monotonic()
+        if not self.running:
+            ACTIVE_TIMERS.inc()
+        self.running = True
+        self.remaining = None
+        self.deadline = now + self.seconds
+        self.seconds_left = self.seconds
+        self.last_shown = None
+        self.emit("start")
+        self._tick()
+
+    def stop(self):
+        if not self.running and not self.paused:
+            return
+        if self.running:
+            ACTIVE_TIMERS.dec()
+        self.running = False
+        self.remaining = None
+        self._cancel_tick()
+        self.emit("stop")
+
+    def pause(self):
+        if not self.running:
+            return
+        self.running = False
+        ACTIVE_TIMERS.dec()
+        self._cancel_tick()
+        self.remaining = max(0.0, self.deadline - self.clock.monotonic())
+        self.emit("pause", self.remaining)
+
+    def resume(self, now=None):
+        if not self.paused:
+            return
+        self.check()
+        if now is None:
+            now = self.clock.monotonic()
+        ACTIVE_TIMERS.inc()
+        self.running = True
+        self.deadline = now + self.remaining
+        self.remaining = None
+        self.last_shown = None
+        self.emit("resume")
+        self._tick()
+
+    def _cancel_tick(self):
+        if self.handle is not None:
+            self.scheduler.cancel(self.handle)
+            self.handle = None
+        self.wake = None
+
+    def _tick(self):
+        self.handle = None
+        if not self.running:
+            return
+        now = self.clock.monotonic()
+        if self.wake is not None and now >= self.wake:
+            TICK_LATENESS.observe(now - self.wake)
+        self.wake = None
+        seconds_left = remaining_seconds(self.deadline, now)
+        if seconds_left > 0:
+            # the scheduler may wake a little early or late; emit once per
+            # displayed second
+            changed = seconds_left != self.last_shown
+            self.last_shown = self.seconds_left = seconds_left
+            # wake on the next whole-second edge of the deadline
+            self.wake = self.deadline - (seconds_left - 1)
+            self.handle = self.scheduler.call_at(self.wake, self._tick)
+            if changed:
+                self.emit("tick", seconds_left)
+                # a "tick" subscriber may have stopped us
+                if self.running and seconds_left <= self.warning:
+                    self.emit("warning", seconds_left)
+        else:  # time up
+            self.seconds_left = 0
+            self.emit("expire")
+            if not self.running:
+                return  # a subscriber stopped us
+            if self.loop:
+                self.deadline = advance_deadline(self.deadline, self.seconds, now)
+                self.last_shown = None
+                self.emit("loop")
+                self._tick()
+            else:
+                self.running = False
+                ACTIVE_TIMERS.dec()
+                self.emit("finish")
+
+
+class Schedule(EventEmitter):
+    # One pending start on the shared ScheduleDispatcher (or any object with
+    # the same schedule_at/reschedule/cancel interface). `deliver` moves the
+    # "fire" event onto the subscriber's thread (e.g. Tk's after(0, ...));
+    # by default it is emitted on the dispatcher thread.
+
+    def __init__(self, dispatcher=None, deliver=None, clock=None):
+        super().__init__()
+        self.dispatcher = get_dispatcher() if dispatcher is None else dispatcher
+        self.deliver = deliver
+        self.clock = SYSTEM_CLOCK if clock is None else clock
+        self.job_id = None
+        self.deadline = None
+        # bumped on cancel and on every new job, so a firing that is already
+        # on its way to `deliver` can tell it has been superseded
+        self.generation = 0
+
+    @property
+    def pending(self):
+        return self.job_id is not None
+
+    def start_at(self, deadline):
+        if self.job_id is None or not self.dispatcher.reschedule(self.job_id, deadline):
+            self.generation += 1
+            self.job_id = self.dispatcher.schedule_at(deadline, self._due, self.generation)
+        self.deadline = deadline
+        self.emit("scheduled", deadline)
+
+    def start_in(self, delay):
+        self.start_at(self.clock.monotonic() + delay)
+
+    def start_at_wall(self, epoch):
+        # anchored to wall-clock time: survives suspend and clock steps
+        if self.job_id is None or not self.dispatcher.reschedule_wall(self.job_id, epoch):
+            self.generation += 1
+            self.job_id = self.dispatcher.schedule_wall(epoch, self._due, self.generation)
+        self.deadline = epoch
+        self.emit("scheduled", epoch)
+
+    def cancel(self):
+        # also drops a firing already handed to `deliver` but not yet run
+        self.generation += 1
+        if self.job_id is None:
+            return False
+        self.dispatcher.cancel(self.job_id)
+        self.job_id = None
+        self.emit("cancel")
+        return True
+
+    def _due(self, generation):
+        if generation != self.generation:
+            return
+        self.job_id = None
+        if self.deliver is not None:
+            self.deliver(lambda: self._fire(generation))
+        else:
+            self._fire(generation)
+
+    def _fire(self, generation):
+        if generation == self.generation:
+            self.emit("fire")
+
+
+class TimerGroup:
+    # Timers started and stopped together. Every timer starts from one
+    # monotonic base time, so their deadlines - and every second edge after
+    # them - are identical and their displays flip on the same instant.
+
+    def __init__(self, timers=(), clock=None):
+        self.timers = list(timers)
+        self.clock = SYSTEM_CLOCK if clock is None else clock
+        self.base = None
+
+    def add(self, timer):
+        self.timers.append(timer)
+        return timer
+
+    def remove(self, timer):
+        if timer in self.timers:
+            self.timers.remove(timer)
+
+    def start(self, now=None):
+        self.base = self.clock.monotonic() if now is None else now
+        for timer in self.timers:
+            timer.start(now=self.base)
+        return self.base
+
+    def stop(self):
+        for timer in self.timers:
+            timer.stop()
+
+    @property
+    def running(self):
+        return sum(1 for timer in self.timers if timer.running)
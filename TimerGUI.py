@@ -1,24 +1,45 @@
-import tkinter as tk
-from tkinter import messagebox
 import time
+STARTED = time.perf_counter()  # for --startup-time
+import json
+import math
+import sys
 import threading
-from datetime import datetime, timedelta
-import pygame
+import tkinter as tk
+from tkinter import messagebox
 import os
 from tkinter import ttk
 from tkinter import filedialog
 from tkinter import colorchooser
-import json
-import pytz
+from LabelRenderer import LabelRenderer
+from TimeStrings import mmss
+from TimingWheel import get_wheel_driver
+from TimerCore import Timer, TimerGroup
+from TimerManifest import load_manifest, apply_manifest
+from TimerJournal import TimerJournal
+from LanSync import LanSync, GROUP, PORT
+from TimerControl import TimerController, parse_address
+from ScheduleRules import RuleScheduler, parse_rule
+from Clock import SYSTEM_CLOCK
+from SoundCache import SoundCache
+from AudioWorker import AudioWorker
+from ConfigStore import ConfigStore
+from Metrics import get_metrics, LagProbe, MetricsExporter
 
 
 class TimezoneClockApp(tk.Toplevel):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, master=None):
+        super().__init__(master)
         self.title("Selectable Multi-Timezone Clock")
         self.geometry("450x500")
+        # pytz and the zone search index load with the first clock window,
+        # not with the timer; the index builds while the window comes up
+        from ZoneClock import ZoneClockTable
+        from ZoneSearch import get_index
+        threading.Thread(target=get_index, name="ZoneIndex", daemon=True).start()
         # Store timezone widgets
         self.clocks = {}  # { tz_name: (frame, label_time) }
+        self.zone_table = ZoneClockTable()
+        self.renderer = LabelRenderer()
 
         # timezones = [
         #     "UTC", "GMT", "PST", "EST", "CET", "IST",
@@ -30,7 +51,9 @@ class TimezoneClockApp(tk.Toplevel):
         self.timezone_dropdown = ttk.Combobox(self,
                                               textvariable=self.timezone_var)
 
-        self.timezone_dropdown['values'] = sorted(pytz.all_timezones)
+        # values are filled from the search index as the user types
+        self.timezone_dropdown.configure(postcommand=self.filter_timezones)
+        self.timezone_dropdown.bind("<KeyRelease>", self.filter_timezones)
         self.timezone_dropdown.set("Select Timezone")
 
         self.timezone_dropdown.pack(pady=10)
@@ -44,9 +67,18 @@ class TimezoneClockApp(tk.Toplevel):
         self.update_clocks()
 
 
-    def add_timezone(self):
+    def filter_timezones(self, event=None):
+        if event is not None and event.keysym in ("Up", "Down", "Return", "Escape"):
+            return
+        text = self.timezone_var.get()
+        if text == "Select Timezone":
+            text = ""
+        from ZoneSearch import get_index
+        self.timezone_dropdown['values'] = get_index().search(text)
 
-        tz = self.timezone_var.get()
+    def add_timezone(self):
+        from ZoneSearch import get_index
+        tz = get_index().resolve(self.timezone_var.get())
         if tz and tz not in self.clocks:
             frame = tk.Frame(self.clock_frame, bd=1, relief="sunken", padx=5, pady=5)
             frame.pack(pady=5, fill="x", padx=10)
@@ -67,137 +99,159 @@ class TimezoneClockApp(tk.Toplevel):
 
     def remove_timezone(self, tz):
         if tz in self.clocks:
-            frame, _ = self.clocks[tz]
+            frame, label_time = self.clocks[tz]
+            self.renderer.forget(label_time)
             frame.destroy()
             del self.clocks[tz]
+            self.zone_table.remove(tz)
 
     def update_clocks(self):
-        now_utc = datetime.utcnow().replace(tzinfo=pytz.utc)
+        now = int(time.time())
         for tz_name, (frame, label_time) in self.clocks.items():
             try:
-                local_time = now_utc.astimezone(pytz.timezone(tz_name))
-                label_time.config(text=local_time.strftime("%H:%M:%S"))
+                self.renderer.render(label_time, text=self.zone_table.time_str(tz_name, now))
             except Exception as e:
-                label_time.config(text="Error")
-        self.after(1000, self.update_clocks)
+                self.renderer.render(label_time, text="Error")
+        # re-arm on the next wall-clock second edge
+        self.after(1000 - int(time.time() * 1000) % 1000, self.update_clocks)
 
 
 # ---- TIMER CLASS ----
 class CountdownTimer(tk.Toplevel):
-    def __init__(self, root, seconds, loop, update_ui_callback, app):
+    # Tk adapter for a core Timer: renders its events onto the app window
+    def __init__(self, root, seconds, loop, update_ui_callback, app, start=True):
         self.root = root
-        self.seconds_init = seconds
-        self.seconds_left = seconds
-        self.loop = loop
-        self.running = True
         self.update_ui_callback = update_ui_callback
         self.app = app
-        self.update_timer()
-
-    def update_timer(self):
-        if not self.running:
-            return
+        # all countdowns under this root share one wheel and one after() chain
+        self.timer = Timer(seconds, app.manager.scheduler(root), loop=loop, warning=app.warning_seconds(),
+                           name=app.profile_name, clock=app.manager.clock)
+        app.manager.journal.attach(self.timer, app.profile_name)
+        sync = app.manager.sync
+        if sync is not None:
+            # an authority announces this timer, a follower mirrors it
+            (sync.publish if sync.role == "authority" else sync.follow)(app.profile_name, self.timer)
+        self.timer.on("tick", self.on_tick)
+        self.timer.on("pause", self.on_pause)
+        self.timer.on("warning", self.on_warning)
+        self.timer.on("expire", self.on_expire)
+        self.timer.on("finish", self.on_finish)
+        if start:  # a TimerGroup starts it later, from a shared base time
+            self.timer.start()
+
+    @property
+    def running(self):
+        return self.timer.running
+
+    @property
+    def seconds_left(self):
+        return self.timer.seconds_left
+
+    def on_tick(self, seconds_left):
+        # stop_timer stops the Timer itself; ticks do not consult
+        # cancel_schedule_flag, which only guards a pending scheduled start
+        self.app.set_label(text=mmss(seconds_left))
+
+    def on_warning(self, seconds_left):
+        self.app.request_sound()
+
+    def on_expire(self):
+        self.app.set_label(text="00:00")
+        self.app.request_sound()
+
+    def on_finish(self):
+        messagebox.showinfo("Timer", "⏰ Time is up!")
+        self.update_ui_callback()
 
-        if self.app.cancel_schedule_flag.get():
-            self.app.timer_label.config(text="00:00")
-            self.timer_running.set(False)
-            return
+    def on_pause(self, remaining):
+        self.app.set_label(text=f"{mmss(math.ceil(remaining))} ||")
 
-        if self.seconds_left > 0:
-            if self.app.cancel_schedule_flag.get() == "True":
-                print("Scheduled timer was cancelled.  inside the update timer function")
-                return
-            mins, secs = divmod(self.seconds_left, 60)
-            self.app.timer_label.config(text=f"{mins:02d}:{secs:02d}")
-            self.seconds_left -= 1
-            self.root.after(1000, self.update_timer)
-            if self.seconds_left < 10:
-                threading.Thread(target=self.app.play_sound).start()
-        else:  #time up
-            self.app.timer_label.config(text="00:00")
-            threading.Thread(target=self.app.play_sound).start()
-            if self.loop and self.running:
-                self.seconds_left = self.seconds_init
-                self.update_timer()
-            elif self.running:
-                messagebox.showinfo("Timer", "⏰ Time is up!")
-                self.update_ui_callback()
+    def toggle_pause(self):
+        if self.timer.paused:
+            self.timer.resume()
+        else:
+            self.timer.pause()
 
     def stop(self):
-        self.running = False
-        self.app.timer_label.config(text="Timer Stopped")
+        self.timer.stop()
+        self.app.set_label(text="Timer Stopped")
         self.update_ui_callback()
 
 
-class App(tk.Tk):
-    def __init__(self):
-        super().__init__()
+class App(tk.Toplevel):
+    def __init__(self, manager, name="default"):
+        super().__init__(manager.root)
+        self.manager = manager
+        self.profile_name = name
         self.title("Menubar Toggle Example")
         self.SOUND_FOLDER = os.getcwd() + "\\audio"
         self.SUPPORTED_EXTENSIONS = (".wav", ".mp3")
         self.timer_job_id = None
-        self.schedule_thread = None
+        self.rule_id = None  # this window's rule on manager.rules
         self.countdown_time = 60
         self.loop_flag = "false"
         self.menu_visible = True
-        self.CONFIG_FILE = "timer_config.json"
-        self.sync_mode = None
+        self.CONFIG_FILE = manager.CONFIG_FILE
+        self.sync_mode = manager.sync.role if manager.sync is not None else None
         self.title_bar_hidden = False
         self.win_x = 0
         self.win_y = 0
-        self.config_file = self.load_config()
-        self.config_file["name"] = self.config_file.get("name", "default")
-        self.volume_var = tk.DoubleVar(value=self.config_file.get("volume", 1.0))
-        self.topmost_var = tk.BooleanVar(value=self.config_file.get("top_most", "False"))
-        self.second_left_var = tk.StringVar(value=self.config_file.get("second_left", 5))
-        self.loop_var = tk.BooleanVar(value=self.config_file.get("loop_timer", "false"))
-        self.selected_sound_file = tk.StringVar(value=self.config_file.get("sound_path", "coin_ringing.wav"))
-        self.font_size_label = self.config_file.get("font_size_label",20)
-        self.schedule_time_str = tk.StringVar(value=self.config_file.get("schedule_time", "6:30"))
-        self.duration_var = tk.StringVar(value=self.config_file.get("timer_duration", "60"))
-
+        # each timer keeps its own profile in the shared config file
+        self.settings = manager.settings.view(name)
+        self.volume_var = tk.DoubleVar(value=self.settings.get("volume", 1.0))
+        self.topmost_var = tk.BooleanVar(value=self.settings.get("top_most", "False"))
+        self.second_left_var = tk.StringVar(value=self.settings.get("second_left", 5))
+        self.loop_var = tk.BooleanVar(value=self.settings.get("loop_timer", "false"))
+        self.selected_sound_file = tk.StringVar(value=self.settings.get("sound_path", "coin_ringing.wav"))
+        self.font_size_label = self.settings.get("font_size_label",20)
+        self.schedule_time_str = tk.StringVar(value=self.settings.get("schedule_time", "6:30"))
+        self.schedule_days = tk.StringVar(value=self.settings.get("schedule_days", ""))
+        self.duration_var = tk.StringVar(value=self.settings.get("timer_duration", "60"))
+        self.renderer = LabelRenderer()
+        # shared by every timer window
+        self.sound_cache = manager.sound_cache
+        self.audio_worker = manager.audio_worker
+
+        self.protocol("WM_DELETE_WINDOW", self.close)
         self.guiSetup()
 
     def init_mixer(self):
-        if not pygame.mixer.get_init():
-            pygame.mixer.init()
+        self.manager.init_mixer()
 
-    def load_config(self):
-        if os.path.exists(self.CONFIG_FILE):
-            try:
-                with open(self.CONFIG_FILE, "r") as f:
-                    return json.load(f)
-            except Exception:
-                return {}
-        return {}
+    def on_map(self, event):
+        # children's <Map> events reach this binding too
+        if event.widget is not self:
+            return
+        self.unbind("<Map>")
+        self.manager.window_mapped(self)
 
-    def save_config(self, data):
-        try:
-            with open(self.CONFIG_FILE, "w") as f:
-                json.dump(data, f)
-        except Exception as e:
-            print("Failed to save config:", e)
+    def set_label(self, **options):
+        # every timer_label update goes through the renderer so unchanged
+        # ticks cost no Tk call
+        self.renderer.render(self.timer_label, **options)
+
+    def close(self):
+        if self.timer_instance:
+            self.timer_instance.timer.stop()
+        self.cancel_rule()
+        self.manager.close_timer(self)
 
     def change_font_color(self):
         # Open color chooser dialog
         color = colorchooser.askcolor(title="Choose Font Color")
         if color[1]:  # color[1] is the hex code
-            self.timer_label.config(fg=color[1])  # Set foreground color
+            self.set_label(fg=color[1])  # Set foreground color
 
-        self.config_file = self.load_config()
-        self.config_file["font_color"] = color[1]
-        self.save_config(self.config_file)
+        self.settings.set("font_color", color[1])
 
     def change_bg_color(self):
         # Open color chooser
         color = colorchooser.askcolor(title="Choose Background Color")
         if color[1]:
             self.configure(bg=color[1])
-            self.timer_label.configure(bg=color[1])  # Keep label background in sync
+            self.set_label(bg=color[1])  # Keep label background in sync
 
-        self.config_file = self.load_config()
-        self.config_file["background_color"] = color[1]
-        self.save_config(self.config_file)
+        self.settings.set("background_color", color[1])
 
     def toggle_title_bar(self):
         self.title_bar_hidden = not self.title_bar_hidden
@@ -238,16 +292,36 @@ class App(tk.Tk):
 
 
     # ---- SOUND FUNCTION ----
+    def sound_path(self):
+        selected_file = self.selected_sound_file.get()
+        if not selected_file:
+            return None
+        return os.path.join(self.SOUND_FOLDER, selected_file)
+
+    def preload_sound(self):
+        # decode the selected file now so the first beep plays from memory
+        import pygame
+        path = self.sound_path()
+        if path and pygame.mixer.get_init():
+            self.sound_cache.preload(path)
+
+    def request_sound(self):
+        # queue a beep on the shared audio worker instead of a new thread
+        # keyed by volume too: windows sharing a file at different volumes
+        # must not merge into one beep at the first window's volume
+        self.audio_worker.request((self.sound_path(), self.volume_var.get()), self.play_sound)
+
     def play_sound(self):
 
         if not self.selected_sound_file.get():
             return
         try:
-            selected_file = self.selected_sound_file.get()
-            if selected_file:
-                sound_path = os.path.join(self.SOUND_FOLDER, selected_file)
-                sound = pygame.mixer.Sound(sound_path)
-                pygame.mixer.music.set_volume(self.volume_var.get())
+            import pygame
+            sound_path = self.sound_path()
+            if sound_path:
+                sound = self.sound_cache.get(sound_path)
+                # the cached Sound is shared, so set this window's volume on it
+                sound.set_volume(self.volume_var.get())
                 sound.play()
         except Exception as e:
             print(f"Sound error: {e}")
@@ -259,9 +333,7 @@ class App(tk.Tk):
 
     def toggle_topmost_from_menu(self):
         self.attributes("-topmost", self.topmost_var.get())
-        self.config_file = self.load_config()
-        self.config_file["top_most"] = self.topmost_var.get()
-        self.save_config(self.config_file)
+        self.settings.set("top_most", self.topmost_var.get())
 
 
     def choose_sound_file(self):
@@ -271,9 +343,8 @@ class App(tk.Tk):
         )
         if file_path:
             self.selected_sound_file.set(file_path)
-            self.config_file = self.load_config()
-            self.config_file["sound_path"] = file_path
-            self.save_config(self.config_file)
+            self.preload_sound()
+            self.settings.set("sound_path", file_path)
 
 
     def set_schedule_time(self):
@@ -283,25 +354,22 @@ class App(tk.Tk):
             sch_time = self.hour_var.get().strip()+":"+self.minute_var.get()
             self.schedule_time_str.set(sch_time)
 
-            self.config_file = self.load_config()
-            self.config_file["schedule_time"] = sch_time
-            self.save_config(self.config_file)
+            self.settings.update({"schedule_time": sch_time, "schedule_days": self.schedule_days.get().strip()})
 
             self.start_timer()
             self.popup.destroy()
 
         self.popup = tk.Toplevel(self)
         self.popup.title("Set Scheduled Start Time")
-        self.popup.geometry("250x100")
+        self.popup.geometry("250x160")
         self.popup.bind("<Button-1>", self.start_move)
         self.popup.bind("<B1-Motion>", self.do_move_popup)
         tk.Label(self.popup, text="Schedule Start Time:").pack(pady=(15, 5))
         dropdown_frame = tk.Frame(self.popup)
         dropdown_frame.pack()
 
-        self.config_file = self.load_config()
-
-        sch_time = self.schedule_time_str.get().split(":")
+        # stop_timer clears the time
+        sch_time = (self.schedule_time_str.get() or "06:30").split(":")
 
         self.hour_var = tk.StringVar(value=sch_time[0])
         self.minute_var = tk.StringVar(value=sch_time[1])
@@ -315,18 +383,28 @@ class App(tk.Tk):
         self.hour_menu.pack(side="left", padx=5)
         self.minute_menu.pack(side="left", padx=5)
 
+        tk.Label(self.popup, text="Days (e.g. mon-fri, blank = every day):").pack(pady=(5, 0))
+        tk.Entry(self.popup, textvariable=self.schedule_days, width=20).pack()
+
         tk.Button(self.popup, text="OK", command=save_time).pack(pady=5)
 
 
+    def warning_seconds(self):
+        # "Sound On After Number Seconds", as saved in the profile
+        try:
+            return int(self.settings.get("second_left", 5))
+        except (TypeError, ValueError):
+            return 5
+
     def open_volume_control(self):
         def set_volume(val):
             volume = float(val) / 100  # Convert 0-100 scale to 0.0-1.0
-            self.config_file = self.load_config()
-            self.config_file["volume"] = volume
-            self.save_config(self.config_file)
+            self.settings.set("volume", volume)
             print (f"sound volume value : {volume}")
             self.volume_var.set(volume)
-            pygame.mixer.music.set_volume(volume)
+            import pygame
+            if pygame.mixer.get_init():
+                pygame.mixer.music.set_volume(volume)
 
         self.popup = tk.Toplevel(self)
         self.popup.title("Set Sound Volume")
@@ -349,9 +427,9 @@ class App(tk.Tk):
                 second_left = int(self.second_left_var.get())
                 self.popup.destroy()
                 # Save to config
-                self.config_file = self.load_config()
-                self.config_file["second_left"] = second_left
-                self.save_config(self.config_file)
+                self.settings.set("second_left", second_left)
+                if self.timer_instance:
+                    self.timer_instance.timer.warning = second_left
 
             except ValueError:
                 messagebox.showerror("Invalid Input", "Please enter a positive number.")
@@ -369,10 +447,8 @@ class App(tk.Tk):
             "Extra Large": 48
         }
         new_size = sizes.get(size_label, 24)
-        self.timer_label.config(font=("Arial", new_size))
-        self.config_file = self.load_config()
-        self.config_file["font_size_label"] = size_label
-        self.save_config(self.config_file)
+        self.set_label(font=("Arial", new_size))
+        self.settings.set("font_size_label", size_label)
 
     def set_timer_duration(self):
         self.popup = tk.Toplevel(self)
@@ -393,9 +469,7 @@ class App(tk.Tk):
                     self.popup.destroy()
 
                     # Save to config
-                    self.config_file = self.load_config()
-                    self.config_file["timer_duration"] = new_time
-                    self.save_config(self.config_file)
+                    self.settings.set("timer_duration", new_time)
 
                 else:
                     raise ValueError
@@ -406,50 +480,34 @@ class App(tk.Tk):
 
     def toggle_loop(self):
         # Save to config
-        self.config_file = self.load_config()
-        self.config_file["loop_timer"] = self.loop_var.get()
-        self.save_config(self.config_file)
+        self.settings.set("loop_timer", self.loop_var.get())
 
     # ---- START TIMER ----
     def start_timer(self):
         try:
-            seconds = self.countdown_time
-            loop = self.loop_var.get()
-
             self.cancel_schedule_flag.set(False)
 
             def begin_timer_after_sync_or_schedule():
-                self.timer_instance = CountdownTimer(self, seconds, loop, self.reset_ui, self)
+                self.start_countdown()
 
             if self.schedule_time_str.get():
                 try:
-                    schedule_time = datetime.strptime(self.schedule_time_str.get(), "%H:%M").replace(
-                        year=datetime.now().year,
-                        month=datetime.now().month,
-                        day=datetime.now().day
-                    )
-                    now = datetime.now()
-                    if schedule_time <= now:
-                        schedule_time += timedelta(days=1)
-
-                    wait_seconds = (schedule_time - now).total_seconds()
-                    self.timer_label.config(text=f"Waiting for {schedule_time.strftime('%H:%M')} to start...")
-
-                    def wait_and_start():
-                        nonlocal wait_seconds
-                        while wait_seconds > 0:
-                            if self.cancel_schedule_flag.get():
-                                print("Scheduled thread cancelled before start.")
-                                return
-                            time.sleep(1)
-                            wait_seconds -= 1
+                    rule = self.schedule_rule()
 
+                    def start_when_due(fire):
                         if not self.cancel_schedule_flag.get():
-                            self.after(0, begin_timer_after_sync_or_schedule)
-
-                    schedule_thread = threading.Thread(target=wait_and_start)
-                    schedule_thread.start()
-                    print(f"Start scheduler timer: job_id={self.timer_job_id}, running={self.timer_running.get()}")
+                            begin_timer_after_sync_or_schedule()
+
+                    # the rule keeps firing, restarting the countdown each
+                    # time, until stop_timer removes it
+                    self.cancel_rule()
+                    self.rule_id = self.manager.rules.add(rule, start_when_due)
+                    self.manager.journal.record("schedule", self.profile_name)
+                    fire = self.manager.rules.next_fire(self.rule_id)
+                    if fire is None:
+                        raise ValueError("the schedule never fires")
+                    self.set_label(text=f"Waiting for {time.strftime('%a %H:%M', time.localtime(fire))} to start...")
+                    print(f"Start scheduler timer: rule_id={self.rule_id}, running={self.timer_running.get()}")
                     return  # skip normal start
                 except ValueError:
                     messagebox.showerror("Invalid Time", "Please enter time in HH:MM format.")
@@ -465,6 +523,32 @@ class App(tk.Tk):
             messagebox.showerror("Invalid input", "Please enter a valid number.")
 
 
+    def start_countdown(self, start=True):
+        # replace any running countdown with a fresh one
+        if self.timer_instance:
+            self.timer_instance.timer.stop()
+        self.timer_instance = CountdownTimer(self, self.countdown_time, self.loop_var.get(), self.reset_ui, self,
+                                             start=start)
+        return self.timer_instance
+
+    def schedule_rule(self):
+        # "schedule_rule" in the profile (e.g. "every 30m" or a cron line)
+        # overrides the time and days picked in the dialog; times are in
+        # "schedule_timezone" if set, else local time
+        text = self.settings.get("schedule_rule") or f"{self.schedule_time_str.get()} {self.schedule_days.get()}"
+        return parse_rule(text, exclude=self.settings.get("schedule_exclude", []),
+                          tz=self.settings.get("schedule_timezone"))
+
+    def cancel_rule(self):
+        if self.rule_id is not None:
+            self.manager.rules.remove(self.rule_id)
+            self.rule_id = None
+            self.manager.journal.record("unschedule", self.profile_name)
+
+    def pause_timer(self):
+        if self.timer_instance and (self.timer_instance.running or self.timer_instance.timer.paused):
+            self.timer_instance.toggle_pause()
+
     # ---- RESET UI ----
     def reset_ui(self):
         # self.entry.config(state='normal')
@@ -485,6 +569,7 @@ class App(tk.Tk):
 
         # Cancel scheduler (even if countdown has started)
         self.cancel_schedule_flag.set(True)
+        self.cancel_rule()
 
         if self.timer_instance:
             self.timer_instance.stop()
@@ -497,7 +582,7 @@ class App(tk.Tk):
 
         # Update UI
         # timer_label.config(font=("Arial", new_size))
-        self.timer_label.config(text="00:00")
+        self.set_label(text="00:00")
 
     def create_popup_menu(self):
         # Right-click popup menu
@@ -542,7 +627,6 @@ class App(tk.Tk):
 
         self.popup_menu.add_separator()
         # add sound volumn to file menu
-        self.volume_var = tk.DoubleVar(value=1.0)
         self.popup_menu.add_command(label="Sound Volume...", command=self.open_volume_control)
         self.popup_menu.add_command(label="Sound File...", command=self.choose_sound_file)
 
@@ -566,16 +650,28 @@ class App(tk.Tk):
             try:
                 name = name_entry.get()
                 prompt.destroy()
-                app = App()
-                app.title(name)
-                app.mainloop()
+                app = self.manager.open_timer(name or "default")
+                app.title(app.profile_name)
             except ValueError:
                 label.config(text="Please enter a valid number!")
         tk.Button(prompt, text="Start Timer", command=start).pack(pady=5)
 
     def open_new_clock(self):
-        clock = TimezoneClockApp()
-        clock.mainloop()
+        TimezoneClockApp(self.manager.root)
+
+    def import_timers(self):
+        file_path = filedialog.askopenfilename(
+            title="Import Timers",
+            filetypes=[("Timer manifest", "*.json *.csv")]
+        )
+        if not file_path:
+            return
+        try:
+            count = self.manager.import_manifest(file_path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Import failed", str(e))
+            return
+        print(f"Imported {count} timers from {file_path}")
 
 
     def create_file_menu(self):
@@ -591,10 +687,14 @@ class App(tk.Tk):
         self.file_menu = tk.Menu(self.menu_bar, tearoff=0)
         self.file_menu.add_command(label="New Timer", command=self.open_new_timer)
         self.file_menu.add_command(label="New Clock", command=self.open_new_clock)
+        self.file_menu.add_command(label="Import Timers...", command=self.import_timers)
+        self.file_menu.add_command(label="Start All Timers", command=self.manager.start_group)
+        self.file_menu.add_command(label="Stop All Timers", command=self.manager.stop_group)
         self.file_menu.add_separator()
 
         self.file_menu.add_command(label="Start Timer", command=self.start_timer)
         self.file_menu.add_command(label="Stop Timer", command=self.stop_timer)
+        self.file_menu.add_command(label="Pause/Resume Timer", command=self.pause_timer)
         self.file_menu.add_separator()
         self.menu_bar.add_cascade(label="File", menu=self.file_menu)
 
@@ -616,7 +716,6 @@ class App(tk.Tk):
         self.timer_running = tk.BooleanVar(value=False)
         self.file_menu.add_command(label="Start on Schedule...", command=self.set_schedule_time)
         # add sound volumn to file menu
-        self.volume_var = tk.DoubleVar(value=1.0)
         self.file_menu.add_command(label="Sound Volume...", command=self.open_volume_control)
         self.file_menu.add_command(label="Set Timer Duration...", command=self.set_timer_duration)
         self.file_menu.add_separator()
@@ -629,7 +728,6 @@ class App(tk.Tk):
         for label in ["Small", "Medium", "Large", "Extra Large"]:
             self.view_menu.add_command(label=label, command=lambda l=label: self.set_timer_font(l))
         # Track the 'Always on Top' state
-        self.config_file = self.load_config()
 
         self.view_menu.add_checkbutton(
             label="Always on Top ✓",
@@ -653,10 +751,9 @@ class App(tk.Tk):
         self.bind("<Button-1>", self.start_move)
         self.bind("<B1-Motion>", self.do_move)
 
-        config = self.load_config()
-        self.countdown_time = config.get("timer_duration", self.countdown_time)
-        #initial sound volume
-        self.init_mixer()
+        self.countdown_time = self.settings.get("timer_duration", self.countdown_time)
+        # the mixer starts once the window is on screen, see on_map
+        self.bind("<Map>", self.on_map)
 
 
         # self.timer_name_label = tk.Label(self, text="Default", font=("Helvetica", 8))
@@ -666,12 +763,12 @@ class App(tk.Tk):
 
         self.set_timer_font(self.font_size_label)
         #load timer font color
-        self.timer_label.config(fg=self.config_file.get("font_color","black"))
+        self.set_label(fg=self.settings.get("font_color","black"))
 
         #load background color
-        self.configure(bg=self.config_file.get("background_color","white"))
-        self.timer_label.configure(bg=self.config_file.get("background_color","white"))
-        # self.timer_name_label.configure(bg=self.config_file.get("background_color","white"))
+        self.configure(bg=self.settings.get("background_color","white"))
+        self.set_label(bg=self.settings.get("background_color","white"))
+        # self.timer_name_label.configure(bg=self.settings.get("background_color","white"))
         self.timer_instance = None
         self.create_file_menu()
         self.create_view_menu()
@@ -679,7 +776,298 @@ class App(tk.Tk):
         self.create_popup_menu()
 
 
+class AppController(TimerController):
+    # control API commands against the timer windows: a name is a window's
+    # profile, and its timer is the window's current countdown
+    MAX_WINDOWS = 50  # every API-created timer is a Toplevel; a runaway script stops here
+
+    def __init__(self, manager):
+        super().__init__(clock=manager.clock)
+        self.manager = manager
+
+    def app(self, name):
+        for app in self.manager.timers:
+            if app.profile_name == name:
+                return app
+        return None
+
+    def get(self, name):
+        app = self.app(name)
+        if app is None or app.timer_instance is None:
+            return None
+        return app.timer_instance.timer
+
+    def create(self, name, seconds, loop):
+        app = self.app(name)
+        if app is None:
+            if len(self.manager.timers) >= self.MAX_WINDOWS:
+                raise ValueError(f"too many timer windows (at most {self.MAX_WINDOWS})")
+            app = self.manager.open_timer(name)
+            app.title(name)
+        app.countdown_time = seconds
+        app.loop_var.set(loop)
+        if app.timer_instance is None or not (app.timer_instance.running or app.timer_instance.timer.paused):
+            return app.start_countdown(start=False).timer
+        timer = app.timer_instance.timer
+        timer.seconds = seconds
+        timer.loop = loop
+        return timer
+
+    def delete(self, name):
+        app = self.app(name)
+        if app is None:
+            return False
+        app.stop_timer()
+        if len(self.manager.timers) > 1:  # closing the last window quits
+            app.close()
+        return True
+
+    def names(self):
+        return [app.profile_name for app in self.manager.timers]
+
+    def starting(self, name):
+        # as start_group does: a Stop Timer pressed earlier must not cancel it
+        app = self.app(name)
+        if app is not None:
+            app.cancel_schedule_flag.set(False)
+
+
+class TimerManager:
+    # One hidden Tk root hosting every timer window as a Toplevel, so all
+    # timers share one Tcl interpreter, one event loop, one mixer, one sound
+    # cache, one audio worker and one settings store.
+    CONFIG_FILE = "timer_config.json"
+    JOURNAL_FILE = "timer_journal.jsonl"
+
+    def __init__(self, clock=SYSTEM_CLOCK, startup_report=None, metrics_path=None, metrics_interval=10.0,
+                 sync_role=None, sync_group=GROUP, sync_port=PORT, sync_interface="0.0.0.0",
+                 control_address=None):
+        self.clock = clock
+        # a VirtualClock runs its own callbacks, so timers and scheduled
+        # starts go on it and move only when it is advanced
+        self.virtual = hasattr(clock, "call_at")
+        self.startup_report = startup_report
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.settings = ConfigStore(self.CONFIG_FILE)
+        # running and paused timers, so a crash or kill does not lose them
+        self.journal = TimerJournal(self.JOURNAL_FILE, wall_clock=clock.time)
+        self.sound_cache = SoundCache()
+        self.audio_worker = AudioWorker()
+        self.audio_started = False
+        self.timers = []
+        # every window's recurring start rule, behind one dispatcher job
+        self.rules = RuleScheduler(dispatcher=clock if self.virtual else None,
+                                   deliver=lambda fire: self.root.after(0, fire), clock=clock)
+        # Tk event-loop lag, sampled once a second
+        self.lag_probe = LagProbe(lambda delay, callback: self.root.after(int(delay * 1000), callback),
+                                  get_metrics().histogram("ui_loop_lag_seconds", "How late Tk ran a due after() callback"))
+        self.lag_probe.start()
+        self.register_gauges()
+        self.metrics_exporter = None
+        if metrics_path:
+            self.metrics_exporter = MetricsExporter(get_metrics(), metrics_path, metrics_interval)
+            self.metrics_exporter.start()
+        # countdowns mirrored across machines (see LanSync.py)
+        self.sync = None
+        if sync_role:
+            self.sync = LanSync(sync_role, sync_group, sync_port, sync_interface, clock=clock,
+                                deliver=lambda fn: self.root.after(0, fn), resolve=self.sync_timer)
+            try:
+                self.sync.start()
+            except OSError as e:
+                print(f"Sync error: {e}")
+                self.sync = None
+        # scripting API; commands run on the Tk thread, in batches
+        self.control = None
+        if control_address is not None:
+            from ControlServer import ControlServer  # asyncio only when asked for
+            self.control = ControlServer(AppController(self), control_address,
+                                         deliver=lambda fn: self.root.after(0, fn))
+            try:
+                self.control.start()
+            except OSError as e:
+                print(f"Control server error: {e}")
+                self.control = None
+
+    def register_gauges(self):
+        metrics = get_metrics()
+        metrics.gauge("schedules_pending", "Recurring start rules waiting to fire", fn=self.rules.__len__)
+        # one gauge per stats() field, read at export time
+        for prefix, source in (("sound_cache", self.sound_cache), ("audio", self.audio_worker)):
+            for key in source.stats():
+                metrics.gauge(f"{prefix}_{key}", f"{type(source).__name__} {key}",
+                              fn=lambda source=source, key=key: source.stats()[key])
+
+    def scheduler(self, widget):
+        # what a Timer under `widget` ticks on
+        if self.virtual:
+            return self.clock
+        return get_wheel_driver(widget, self.clock)
+
+    def init_mixer(self):
+        import pygame
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+
+    def window_mapped(self, app):
+        # importing pygame and opening the audio device are the slowest part
+        # of startup, so they wait until a window is on screen and then run
+        # on the audio worker - ahead of any sound it will be asked to play
+        if self.startup_report is not None:
+            app.update_idletasks()
+            report_startup(self.startup_report)
+            self.root.after_idle(self.root.quit)
+            return
+        if not self.audio_started:
+            self.audio_started = True
+            self.audio_worker.control("mixer", self.init_mixer)
+        self.audio_worker.control(("preload", app.profile_name), app.preload_sound)
+
+    def unique_name(self, name):
+        # "Tea", then "Tea 2", "Tea 3", ... while a window already has it
+        taken = {app.profile_name for app in self.timers}
+        unique, n = name, 1
+        while unique in taken:
+            n += 1
+            unique = f"{name} {n}"
+        return unique
+
+    def open_timer(self, name="default"):
+        # one window per name: the name is its settings profile and its
+        # journal and sync key
+        app = App(self, self.unique_name(name))
+        self.timers.append(app)
+        return app
+
+    def recover(self):
+        # reopen the timers that were running, paused or scheduled when the
+        # app last exited, each at its remaining time
+        apps = {app.profile_name: app for app in self.timers}
+        for name in self.journal.names():
+            recovered = self.journal.recover_timer(name)
+            scheduled = name in self.journal.state["schedules"]
+            if recovered is None and not scheduled:
+                continue
+            app = apps.get(name)
+            if app is None:
+                app = apps[name] = self.open_timer(name)
+                app.title(name)
+            if scheduled:
+                app.start_timer()
+            if recovered is not None:
+                seconds, loop, remaining, paused = recovered
+                app.countdown_time = seconds
+                app.loop_var.set(loop)
+                timer = app.start_countdown(start=False).timer
+                # start as if it had begun `seconds - remaining` ago
+                timer.start(now=self.clock.monotonic() + remaining - seconds)
+                if paused:
+                    timer.pause()
+
+    def sync_timer(self, name):
+        # a follower's timer for a name the authority announced
+        for app in self.timers:
+            if app.profile_name == name:
+                break
+        else:
+            app = self.open_timer(name)
+            app.title(name)
+        return app.start_countdown(start=False).timer
+
+    def import_manifest(self, path):
+        # one parse, one batched settings write, then a window per new timer;
+        # windows already open keep their settings until reopened
+        timers = load_manifest(path)
+        apply_manifest(self.settings, timers)
+        open_names = {app.profile_name for app in self.timers}
+        for name, settings in timers.items():
+            if name in open_names:
+                continue
+            app = self.open_timer(name)
+            app.title(name)
+            if "schedule_time" in settings or "schedule_rule" in settings:
+                app.start_timer()
+        return len(timers)
+
+    def start_group(self, apps=None):
+        # every countdown starts from one base time, so all displays flip on
+        # the same instant
+        group = TimerGroup(clock=self.clock)
+        for app in apps or self.timers:
+            app.cancel_rule()
+            app.cancel_schedule_flag.set(False)
+            group.add(app.start_countdown(start=False).timer)
+        group.start()
+        return group
+
+    def stop_group(self, apps=None):
+        for app in list(apps or self.timers):
+            app.stop_timer()
+
+    def close_timer(self, app):
+        if app in self.timers:
+            self.timers.remove(app)
+        app.destroy()
+        if not self.timers:
+            self.root.quit()
+
+    def run(self):
+        self.root.mainloop()
+        # write out anything still waiting for the debounce interval
+        self.settings.close()
+        # a clean exit, by File > Exit or by closing the last window, as
+        # closing one window does: nothing to recover on the next start
+        self.journal.clear()
+        if self.sync is not None:
+            self.sync.stop()
+        if self.control is not None:
+            self.control.stop()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+
+
+def report_startup(target):
+    # time from the first line of this module to the first window being
+    # painted, written as JSON to `target` ("-" for stdout; a --noconsole
+    # build has no stdout)
+    report = {
+        "first_paint_ms": (time.perf_counter() - STARTED) * 1000,
+        "first_paint_epoch": time.time(),
+        "frozen": bool(getattr(sys, "frozen", False)),
+        "pygame_loaded": "pygame" in sys.modules,
+        "pytz_loaded": "pytz" in sys.modules,
+    }
+    if target == "-":
+        print(json.dumps(report), flush=True)
+    else:
+        with open(target, "w") as f:
+            json.dump(report, f)
+
+
 # Run the app
 if __name__ == "__main__":
-    app = App()
-    app.mainloop()
+    import argparse
+    parser = argparse.ArgumentParser(description="Synced countdown timer")
+    parser.add_argument("--startup-time", nargs="?", const="-", metavar="FILE",
+                        help="report time to first paint as JSON (to FILE, default stdout) and exit")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="keep runtime metrics in FILE (Prometheus text if it ends in .prom, else JSON)")
+    parser.add_argument("--metrics-interval", type=float, default=10.0, metavar="SECONDS",
+                        help="how often the metrics file is rewritten")
+    parser.add_argument("--sync", choices=("authority", "follower"),
+                        help="keep countdowns in step with other machines on the LAN")
+    parser.add_argument("--sync-group", default=GROUP, help="multicast group for --sync")
+    parser.add_argument("--sync-port", type=int, default=PORT, help="UDP port for --sync")
+    parser.add_argument("--sync-interface", default="0.0.0.0", metavar="ADDRESS",
+                        help="local address of the interface to sync on")
+    parser.add_argument("--control", type=parse_address, metavar="ADDRESS",
+                        help="serve the control API on a localhost port, host:port or Unix socket path")
+    args = parser.parse_args()
+    manager = TimerManager(startup_report=args.startup_time, metrics_path=args.metrics,
+                           metrics_interval=args.metrics_interval, sync_role=args.sync,
+                           sync_group=args.sync_group, sync_port=args.sync_port,
+                           sync_interface=args.sync_interface, control_address=args.control)
+    manager.open_timer()
+    manager.recover()
+    manager.run()
@@ -0,0 +1,182 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from Deadline import advance_deadline
+
+# Append-only journal of timer state changes, so running countdowns and
+# pending schedules survive a crash or a kill. Each change is one JSON line:
+#
+#     {"op": "start", "name": "Tea", "seconds": 180, "loop": false, "deadline": 1767225780.5}
+#     {"op": "pause", "name": "Tea", "left": 92.3}
+#     {"op": "stop", "name": "Tea"}
+#     {"op": "schedule", "name": "Tea", "next_fire": 1767250800.0}
+#
+# Ticks are never written: a running timer is fully described by its
+# wall-clock deadline. After `compact_every` records the file is rewritten
+# as one record per live timer or schedule, through a temp file and
+# os.replace, so replaying it on start-up stays bounded however long the app
+# has been up. A clean exit clear()s the journal: only a crash or a kill
+# leaves timers to recover.
+
+def fold(state, record):
+    # apply one record to {"timers": {...}, "schedules": {...}}
+    op = record.get("op")
+    name = record.get("name")
+    if name is None:
+        return
+    if op in ("start", "resume"):
+        state["timers"][name] = {"op": "start", "name": name, "seconds": record["seconds"],
+                                 "loop": record.get("loop", False), "deadline": record["deadline"]}
+    elif op == "pause":
+        timer = state["timers"].get(name)
+        if timer is not None:
+            state["timers"][name] = dict(timer, op="pause", left=record["left"])
+    elif op == "stop":
+        state["timers"].pop(name, None)
+    elif op == "schedule":
+        state["schedules"][name] = dict(record)
+    elif op == "unschedule":
+        state["schedules"].pop(name, None)
+
+
+class TimerJournal:
+    def __init__(self, path, compact_every=500, sync=False, wall_clock=time.time):
+        self.path = path
+        self.compact_every = compact_every
+        self.sync = sync  # fsync every record, not only on compaction
+        self.wall_clock = wall_clock
+        self.lock = threading.Lock()
+        self.state = {"timers": {}, "schedules": {}}
+        self.file = None
+        self.records = 0       # appended since the last compaction
+        self.replayed = 0
+        self.skipped = 0       # unreadable lines, e.g. a write cut short
+        self.compactions = 0
+        self.replay()
+
+    def replay(self):
+        # rebuild the state from the file, then start a fresh compacted one
+        with self.lock:
+            self.state = {"timers": {}, "schedules": {}}
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            fold(self.state, json.loads(line))
+                            self.replayed += 1
+                        except (ValueError, KeyError, TypeError):
+                            self.skipped += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Journal read error: {e}")
+            self._compact()
+        return self.state
+
+    def record(self, op, name, **fields):
+        record = dict(op=op, name=name, **fields)
+        line = json.dumps(record) + "\n"
+        with self.lock:
+            fold(self.state, record)
+            try:
+                if self.file is None:
+                    self.file = open(self.path, "a", encoding="utf-8")
+                self.file.write(line)
+                self.file.flush()
+                if self.sync:
+                    os.fsync(self.file.fileno())
+            except OSError as e:
+                print(f"Journal write error: {e}")
+                return
+            self.records += 1
+            if self.records >= self.compact_every:
+                self._compact()
+
+    def compact(self):
+        with self.lock:
+            self._compact()
+
+    def _compact(self):
+        lines = [json.dumps(r) + "\n" for r in self.state["timers"].values()]
+        lines += [json.dumps(r) + "\n" for r in self.state["schedules"].values()]
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix=".timer_journal.", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.writelines(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            print(f"Journal compaction error: {e}")
+            return
+        self.records = 0
+        self.compactions += 1
+
+    def close(self):
+        with self.lock:
+            self._compact()
+
+    def clear(self):
+        # forget every timer and schedule, e.g. on a clean exit
+        with self.lock:
+            self.state = {"timers": {}, "schedules": {}}
+            self._compact()
+
+    # -- Timer events --
+
+    def attach(self, timer, name):
+        # journal a core Timer's state changes; its monotonic deadline is
+        # stored as a wall-clock epoch so it means something after a restart
+        def wall_deadline():
+            return self.wall_clock() + (timer.deadline - timer.clock.monotonic())
+
+        def started():
+            self.record("start", name, seconds=timer.seconds, loop=timer.loop, deadline=wall_deadline())
+
+        timer.on("start", started)
+        timer.on("resume", started)
+        timer.on("pause", lambda left: self.record("pause", name, left=left))
+        timer.on("stop", lambda: self.record("stop", name))
+        timer.on("finish", lambda: self.record("stop", name))
+
+    # -- recovery --
+
+    def recover_timer(self, name, now=None):
+        # (seconds, loop, remaining, paused) for a timer to resume, or None
+        # if it was stopped or ran out while the app was down
+        record = self.state["timers"].get(name)
+        if record is None:
+            return None
+        if record["op"] == "pause":
+            return record["seconds"], record["loop"], record["left"], True
+        now = self.wall_clock() if now is None else now
+        deadline = record["deadline"]
+        if deadline <= now:
+            if not record["loop"]:
+                self.record("stop", name)  # finished while the app was down
+                return None
+            deadline = advance_deadline(deadline, record["seconds"], now)
+        return record["seconds"], record["loop"], deadline - now, False
+
+    def names(self):
+        with self.lock:
+            return sorted(set(self.state["timers"]) | set(self.state["schedules"]))
+
+    def stats(self):
+        with self.lock:
+            return {"live_timers": len(self.state["timers"]), "live_schedules": len(self.state["schedules"]),
+                    "records": self.records, "replayed": self.replayed, "skipped": self.skipped,
+                    "compactions": self.compactions}
@@ -0,0 +1,137 @@
+import csv
+import json
+import os
+
+# Bulk timer definitions. A manifest is a JSON list of objects, or a CSV file
+# with a header row, one timer per entry:
+#
+#     [{"name": "Station 1", "duration": "5:00", "loop": true,
+#       "sound": "coin_ringing.wav", "schedule": "06:30", "days": "mon-fri"}]
+#
+#     name,duration,loop,sound,schedule,days,exclude
+#     Station 1,300,yes,coin_ringing.wav,06:30,mon-fri,2026-12-25;2026-12-26
+#
+# Each entry becomes the settings of one profile in the config file, under
+# the same keys the timer windows use. The whole file is parsed and checked
+# first; apply_manifest then writes every profile in one ConfigStore batch.
+
+# manifest columns copied to a profile setting as text; duration, loop,
+# volume, warning, schedule and exclude are parsed below
+TEXT_FIELDS = {
+    "sound": "sound_path",
+    "days": "schedule_days",
+    "timezone": "schedule_timezone",
+}
+TRUE = {"1", "true", "yes", "y", "on"}
+FALSE = {"0", "false", "no", "n", "off", ""}
+
+
+def parse_duration(value):
+    # seconds as a number, "MM:SS" or "HH:MM:SS"
+    if isinstance(value, (int, float)):
+        seconds = int(value)
+    else:
+        seconds = 0
+        for part in str(value).strip().split(":"):
+            seconds = seconds * 60 + int(part)
+    if seconds <= 0:
+        raise ValueError("duration must be positive")
+    return seconds
+
+
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE:
+        return True
+    if text in FALSE:
+        return False
+    raise ValueError(f"not a yes/no value: {value!r}")
+
+
+def entry_settings(entry):
+    # one manifest entry -> {setting: value}; raises ValueError
+    from ScheduleRules import parse_rule
+    settings = {}
+    for column, value in entry.items():
+        # an empty CSV cell means "not set"
+        if column is None or value is None or (isinstance(value, str) and not value.strip()):
+            continue
+        column = column.strip().lower()
+        if column == "name":
+            continue
+        if column == "duration":
+            settings["timer_duration"] = parse_duration(value)
+        elif column == "loop":
+            settings["loop_timer"] = parse_bool(value)
+        elif column == "volume":
+            settings["volume"] = float(value)
+        elif column == "warning":
+            settings["second_left"] = int(value)
+        elif column == "exclude":
+            settings["schedule_exclude"] = value if isinstance(value, list) else [
+                d.strip() for d in str(value).split(";") if d.strip()]
+        elif column == "schedule":
+            # a plain time goes to the dialog's setting, anything else
+            # ("every 15m", cron) is a full rule
+            value = str(value).strip()
+            if len(value.split()) == 1 and ":" in value:
+                settings["schedule_time"] = value
+            else:
+                settings["schedule_rule"] = value
+        elif column in TEXT_FIELDS:
+            settings[TEXT_FIELDS[column]] = str(value).strip()
+        else:
+            raise ValueError(f"unknown column {column!r}")
+    # the schedule must parse now, not when the timer first starts
+    if "schedule_time" in settings or "schedule_rule" in settings:
+        text = settings.get("schedule_rule") or f"{settings['schedule_time']} {settings.get('schedule_days', '')}"
+        parse_rule(text, settings.get("schedule_exclude", ()), settings.get("schedule_timezone"))
+    return settings
+
+
+def read_entries(path):
+    # the raw entries of a .json or .csv manifest, in file order
+    if os.path.splitext(path)[1].lower() == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            return list(csv.DictReader(f))
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("timers", [])
+    if not isinstance(data, list):
+        raise ValueError("a JSON manifest is a list of timers (or {\"timers\": [...]})")
+    return data
+
+
+def load_manifest(path):
+    # {name: settings} in file order; every problem in the file is reported
+    # in one ValueError, and nothing is returned unless all entries are valid
+    timers = {}
+    errors = []
+    for number, entry in enumerate(read_entries(path), 1):
+        if not isinstance(entry, dict):
+            errors.append(f"entry {number}: not an object")
+            continue
+        name = str(entry.get("name") or "").strip()
+        if not name:
+            errors.append(f"entry {number}: missing name")
+            continue
+        if name in timers:
+            errors.append(f"entry {number}: duplicate name {name!r}")
+            continue
+        try:
+            timers[name] = entry_settings(entry)
+        except (ValueError, KeyError) as e:
+            errors.append(f"entry {number} ({name}): {e}")
+    if errors:
+        shown = "\n".join(errors[:10])
+        more = f"\n... and {len(errors) - 10} more" if len(errors) > 10 else ""
+        raise ValueError(f"{len(errors)} invalid manifest entries:\n{shown}{more}")
+    return timers
+
+
+def apply_manifest(store, timers):
+    # write every timer's profile in one batch; returns the settings changed
+    return store.update_profiles(timers)
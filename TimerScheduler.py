@@ -1,17 +1,15 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import threading
 import time
-from datetime import datetime, timedelta
+from TimerCore import Timer, Schedule
+from ScheduleRules import parse_rule
+from Clock import SYSTEM_CLOCK
+from TimingWheel import get_wheel_driver
 
 # Initialize GUI
 window = tk.Tk()
 window.title("Smart Timer")
 
-# State variables
-timer_job_id = None
-schedule_thread = None
-
 # Tkinter Variables
 countdown_time = 10  # seconds
 timer_running = tk.BooleanVar(value=False)
@@ -35,71 +33,58 @@ start_button.pack(pady=5)
 stop_button.pack(pady=5)
 
 # --- Core Logic ---
+# The countdown and the scheduled start run in TimerCore; the functions
+# below only subscribe to their events and update the widgets.
+clock = SYSTEM_CLOCK
+timer = Timer(countdown_time, get_wheel_driver(window), clock=clock)
+schedule = Schedule(deliver=lambda fire: window.after(0, fire), clock=clock)
 
-def count_down(seconds_left):
-    global timer_job_id
+def show_remaining(seconds_left):
+    mins, secs = divmod(seconds_left, 60)
+    timer_label.config(text=f"{mins:02}:{secs:02}")
 
-    if cancel_schedule_flag.get():
-        timer_label.config(text="Timer cancelled.")
-        start_button.config(state="normal")
-        stop_button.config(state="disabled")
-        timer_running.set(False)
-        return
+def reset_buttons():
+    timer_running.set(False)
+    start_button.config(state="normal")
+    stop_button.config(state="disabled")
 
-    if seconds_left <= 0:
-        timer_label.config(text="⏰ Time's up!")
-        timer_running.set(False)
-        start_button.config(state="normal")
-        stop_button.config(state="disabled")
-        return
+def on_finish():
+    timer_label.config(text="⏰ Time's up!")
+    reset_buttons()
 
-    mins, secs = divmod(seconds_left, 60)
-    timer_label.config(text=f"{mins:02}:{secs:02}")
+def count_down(seconds):
+    timer.seconds = seconds
     timer_running.set(True)
-    timer_job_id = window.after(1000, lambda: count_down(seconds_left - 1))
+    timer.start()
 
 def begin_timer_after_schedule():
     if not cancel_schedule_flag.get():
         count_down(countdown_time)
 
+timer.on("tick", show_remaining)
+timer.on("finish", on_finish)
+schedule.on("fire", begin_timer_after_schedule)
+
 def start_timer():
-    global schedule_thread
     start_button.config(state="disabled")
     stop_button.config(state="normal")
     cancel_schedule_flag.set(False)
 
     if schedule_time_str.get().strip():
         try:
-            # Parse and calculate delay
-            schedule_time = datetime.strptime(schedule_time_str.get(), "%H:%M").replace(
-                year=datetime.now().year,
-                month=datetime.now().month,
-                day=datetime.now().day
-            )
-            now = datetime.now()
-            if schedule_time <= now:
-                schedule_time += timedelta(days=1)
-            delay = int((schedule_time - now).total_seconds())
-
-            timer_label.config(text=f"⏳ Waiting for {schedule_time.strftime('%H:%M')}...")
-
-            # Scheduler thread
-            def wait_and_start():
-                remaining = delay
-                while remaining > 0:
-                    if cancel_schedule_flag.get():
-                        print("Scheduled timer cancelled before start.")
-                        return
-                    time.sleep(1)
-                    remaining -= 1
-                if not cancel_schedule_flag.get():
-                    window.after(0, begin_timer_after_schedule)
-
-            schedule_thread = threading.Thread(target=wait_and_start, daemon=True)
-            schedule_thread.start()
+            # "HH:MM", optionally followed by days ("07:00 mon-fri")
+            due = parse_rule(schedule_time_str.get()).next_fire(clock.time())
+            if due is None:
+                raise ValueError("the schedule never fires")
+
+            timer_label.config(text=f"⏳ Waiting for {time.strftime('%a %H:%M', time.localtime(due))}...")
+
+            # Hand the start to the shared dispatcher thread, anchored to the
+            # wall clock so a suspend or clock step does not shift it
+            schedule.start_at_wall(due)
             return
         except ValueError:
-            messagebox.showerror("Invalid Time", "Use format HH:MM")
+            messagebox.showerror("Invalid Time", "Use format HH:MM [days]")
             stop_timer()
             return
 
@@ -107,16 +92,13 @@ def start_timer():
     begin_timer_after_schedule()
 
 def stop_timer():
-    global timer_job_id
-
     # Cancel active countdown
-    if timer_running.get() and timer_job_id:
-        window.after_cancel(timer_job_id)
-        timer_job_id = None
-        timer_running.set(False)
+    timer.stop()
+    timer_running.set(False)
 
     # Cancel scheduler
     cancel_schedule_flag.set(True)
+    schedule.cancel()
 
     # Reset GUI
     timer_label.config(text="Timer stopped.")
@@ -0,0 +1,228 @@
+import math
+import threading
+import time
+
+# Hierarchical timing wheel: one store for every pending timer callback in the
+# process, with O(1) insert and cancel. Level 0 has 256 slots of one tick
+# each, every higher level has 64 slots covering 64 slots of the level below.
+# Far-away timers sit in a coarse slot and cascade down as time approaches.
+
+LEVEL0_BITS = 8
+LEVEL_BITS = 6
+LEVELS = 5
+LEVEL0_SIZE = 1 << LEVEL0_BITS
+LEVEL_SIZE = 1 << LEVEL_BITS
+# furthest delta (in ticks) a timer can be placed at before it is clamped
+MAX_DELTA = (1 << (LEVEL0_BITS + LEVEL_BITS * (LEVELS - 1))) - 1
+
+
+class TimerHandle:
+    __slots__ = ("expires", "deadline", "callback", "args", "bucket")
+
+    def __init__(self, expires, deadline, callback, args):
+        self.expires = expires
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.bucket = None
+
+    @property
+    def active(self):
+        return self.bucket is not None
+
+
+class TimingWheel:
+    def __init__(self, tick=0.01, clock=time.monotonic):
+        self.tick = tick
+        self.clock = clock
+        self.origin = clock()
+        self.current = 0  # last tick that has been processed
+        self.count = 0
+        # buckets are dicts used as ordered sets, so removal is O(1)
+        self.levels = [[{} for _ in range(LEVEL0_SIZE)]]
+        for _ in range(LEVELS - 1):
+            self.levels.append([{} for _ in range(LEVEL_SIZE)])
+
+    def __len__(self):
+        return self.count
+
+    def to_tick(self, deadline):
+        # round up: a timer must never fire before its deadline
+        return math.ceil((deadline - self.origin) / self.tick - 1e-9)
+
+    def schedule_at(self, deadline, callback, *args):
+        handle = TimerHandle(self.to_tick(deadline), deadline, callback, args)
+        self._place(handle)
+        self.count += 1
+        return handle
+
+    def schedule(self, delay, callback, *args):
+        return self.schedule_at(self.clock() + delay, callback, *args)
+
+    # same interface as the drivers, so a bare wheel can be stepped by hand
+    call_at = schedule_at
+
+    def cancel(self, handle):
+        if handle.bucket is None:
+            return False
+        del handle.bucket[handle]
+        handle.bucket = None
+        self.count -= 1
+        return True
+
+    def _place(self, handle, earliest=1):
+        # `earliest` is 0 while cascading: the current level-0 slot has not
+        # been emptied yet, so a timer due on this very tick can still go in
+        expires = max(handle.expires, self.current + earliest)
+        delta = min(expires - self.current, MAX_DELTA)
+        if delta < LEVEL0_SIZE:
+            bucket = self.levels[0][expires & (LEVEL0_SIZE - 1)]
+        else:
+            expires = self.current + delta
+            level = 1
+            shift = LEVEL0_BITS
+            while delta >= 1 << (shift + LEVEL_BITS):
+                level += 1
+                shift += LEVEL_BITS
+            bucket = self.levels[level][(expires >> shift) & (LEVEL_SIZE - 1)]
+        bucket[handle] = None
+        handle.bucket = bucket
+
+    def _cascade(self, level, shift):
+        index = (self.current >> shift) & (LEVEL_SIZE - 1)
+        bucket = self.levels[level][index]
+        self.levels[level][index] = {}
+        for handle in bucket:
+            self._place(handle, earliest=0)
+        return index
+
+    def advance(self, now=None):
+        # Process every tick up to `now` and run the expired callbacks as one
+        # batch, in deadline order. Returns the number of callbacks fired.
+        if now is None:
+            now = self.clock()
+        target = math.floor((now - self.origin) / self.tick + 1e-9)
+        if target <= self.current:
+            return 0
+        if self.count == 0:
+            # nothing pending: skip the idle ticks outright
+            self.current = target
+            return 0
+
+        expired = []
+        level0 = self.levels[0]
+        while self.current < target and self.count > len(expired):
+            self.current += 1
+            index = self.current & (LEVEL0_SIZE - 1)
+            if index == 0:
+                level = 1
+                shift = LEVEL0_BITS
+                while level < LEVELS and self._cascade(level, shift) == 0:
+                    level += 1
+                    shift += LEVEL_BITS
+            bucket = level0[index]
+            if bucket:
+                level0[index] = {}
+                for handle in bucket:
+                    handle.bucket = None
+                expired.extend(bucket)
+        self.current = target
+        self.count -= len(expired)
+
+        expired.sort(key=lambda h: h.deadline)
+        for handle in expired:
+            try:
+                handle.callback(*handle.args)
+            except Exception as e:
+                # one failing timer must not starve the rest of the batch
+                print(f"Timer callback error: {e}")
+        return len(expired)
+
+
+class TkWheelDriver:
+    # One after() chain per Tk root that advances a shared TimingWheel, so any
+    # number of countdowns cost a single Tk timer. The chain only runs while
+    # something is scheduled.
+
+    def __init__(self, root, wheel=None, interval_ms=10):
+        self.root = root
+        self.wheel = TimingWheel(tick=interval_ms / 1000) if wheel is None else wheel
+        self.interval_ms = interval_ms
+        self.after_id = None
+
+    def call_at(self, deadline, callback, *args):
+        handle = self.wheel.schedule_at(deadline, callback, *args)
+        self._arm()
+        return handle
+
+    def call_later(self, delay, callback, *args):
+        return self.call_at(self.wheel.clock() + delay, callback, *args)
+
+    def cancel(self, handle):
+        return self.wheel.cancel(handle)
+
+    def _arm(self):
+        if self.after_id is None:
+            self.after_id = self.root.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        self.after_id = None
+        self.wheel.advance()
+        if len(self.wheel):
+            self._arm()
+
+
+class ThreadWheelDriver:
+    # Headless counterpart of TkWheelDriver: a daemon thread advances the
+    # wheel every tick while anything is scheduled. Callbacks run on that
+    # thread, under the driver lock.
+
+    def __init__(self, wheel=None, interval=0.01):
+        self.wheel = TimingWheel(tick=interval) if wheel is None else wheel
+        self.interval = interval
+        self.lock = threading.RLock()
+        self.wakeup = threading.Condition(self.lock)
+        self.thread = None
+        self.running = False
+
+    def call_at(self, deadline, callback, *args):
+        with self.lock:
+            handle = self.wheel.schedule_at(deadline, callback, *args)
+            if not self.running:
+                self.running = True
+                self.thread = threading.Thread(target=self._run, name="TimingWheel", daemon=True)
+                self.thread.start()
+            self.wakeup.notify()
+        return handle
+
+    def call_later(self, delay, callback, *args):
+        return self.call_at(self.wheel.clock() + delay, callback, *args)
+
+    def cancel(self, handle):
+        with self.lock:
+            return self.wheel.cancel(handle)
+
+    def stop(self):
+        with self.lock:
+            self.running = False
+            self.wakeup.notify()
+
+    def _run(self):
+        with self.lock:
+            while self.running:
+                if not len(self.wheel):
+                    self.wakeup.wait()
+                    continue
+                self.wheel.advance()
+                self.wakeup.wait(self.interval)
+
+
+def get_wheel_driver(widget, clock=None):
+    # the driver shared by every timer under this widget's Tk root; `clock`
+    # (a Clock.py clock) is read by the wheel when the driver is first made
+    root = widget._root()
+    driver = getattr(root, "_wheel_driver", None)
+    if driver is None:
+        driver = TkWheelDriver(root, None if clock is None else TimingWheel(clock=clock.monotonic))
+        root._wheel_driver = driver
+    return driver
@@ -0,0 +1,88 @@
+import math
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from functools import lru_cache
+import time
+import pytz
+from TimeStrings import hhmmss
+
+# Wall clocks for many time zones. A zone's UTC offset only changes at DST or
+# rule transitions, so each zone keeps its current offset and the epoch range
+# it is valid for; a tick is then an integer add and a table lookup.
+
+EPOCH = datetime(1970, 1, 1)
+# zones without a transition table are re-checked on this boundary
+# (every real-world transition falls on a quarter hour)
+RECHECK_SECONDS = 900
+
+
+@lru_cache(maxsize=None)
+def get_zone(name):
+    return pytz.timezone(name)
+
+
+def to_epoch(naive_utc):
+    return (naive_utc - EPOCH).total_seconds()
+
+
+def from_epoch(epoch):
+    return EPOCH + timedelta(seconds=epoch)
+
+
+class ZoneOffset:
+    def __init__(self, name):
+        self.name = name
+        self.tz = get_zone(name)
+        self.offset = 0
+        self.valid_from = math.inf
+        self.valid_until = -math.inf
+
+    def offset_at(self, epoch):
+        if not self.valid_from <= epoch < self.valid_until:
+            self.resolve(epoch)
+        return self.offset
+
+    def resolve(self, epoch):
+        transitions = getattr(self.tz, "_utc_transition_times", None)
+        info = getattr(self.tz, "_transition_info", None)
+        if transitions and info:
+            # pytz DstTzInfo: bisect its UTC transition table
+            index = bisect_right(transitions, from_epoch(epoch)) - 1
+            index = max(index, 0)
+            self.offset = int(info[index][0].total_seconds())
+            self.valid_from = to_epoch(transitions[index]) if index > 0 else -math.inf
+            self.valid_until = to_epoch(transitions[index + 1]) if index + 1 < len(transitions) else math.inf
+        else:
+            utc = pytz.utc.localize(from_epoch(epoch))
+            self.offset = int(utc.astimezone(self.tz).utcoffset().total_seconds())
+            if isinstance(self.tz, pytz.tzinfo.StaticTzInfo) or self.tz is pytz.utc:
+                self.valid_from, self.valid_until = -math.inf, math.inf
+            else:
+                start = epoch - epoch % RECHECK_SECONDS
+                self.valid_from, self.valid_until = start, start + RECHECK_SECONDS
+
+
+class ZoneClockTable:
+    def __init__(self):
+        self.zones = {}  # name -> ZoneOffset
+
+    def add(self, name):
+        zone = self.zones.get(name)
+        if zone is None:
+            zone = self.zones[name] = ZoneOffset(name)
+        return zone
+
+    def remove(self, name):
+        self.zones.pop(name, None)
+
+    def time_str(self, name, now=None):
+        # "HH:MM:SS" local time in zone `name` at epoch second `now`
+        if now is None:
+            now = int(time.time())
+        zone = self.zones.get(name) or self.add(name)
+        return hhmmss((now + zone.offset_at(now)) % 86400)
+
+    def time_strs(self, now=None):
+        if now is None:
+            now = int(time.time())
+        return {name: hhmmss((now + zone.offset_at(now)) % 86400) for name, zone in self.zones.items()}
@@ -0,0 +1,130 @@
+import difflib
+import threading
+from bisect import bisect_left
+from datetime import datetime
+import pytz
+
+# Search index over time zone names for the clock picker. Every zone is
+# reachable by its full name, each path component and word ("new york"),
+# its country code and name, and the abbreviations it uses in winter and
+# summer ("pst", "cest"). Keys live in one sorted list, so a prefix lookup is
+# a bisect; queries with no prefix hit fall back to fuzzy matching over the
+# distinct keys.
+# The index is built on first use, not when the clock window opens.
+
+# the zone people usually mean by an abbreviation many zones share; without
+# this "est" would pick whichever EST zone sorts first
+PREFERRED = {
+    "est": "America/New_York", "edt": "America/New_York",
+    "cst": "America/Chicago", "cdt": "America/Chicago",
+    "mst": "America/Denver", "mdt": "America/Denver",
+    "pst": "America/Los_Angeles", "pdt": "America/Los_Angeles",
+    "akst": "America/Anchorage", "akdt": "America/Anchorage",
+    "hst": "Pacific/Honolulu",
+    "bst": "Europe/London",
+    "cet": "Europe/Paris", "cest": "Europe/Paris",
+    "eet": "Europe/Athens", "eest": "Europe/Athens",
+    "ist": "Asia/Kolkata",
+    "aest": "Australia/Sydney", "aedt": "Australia/Sydney",
+}
+
+
+class ZoneSearchIndex:
+    def __init__(self):
+        self.primary = set(pytz.common_timezones)
+        self.common = sorted(self.primary)  # what an empty query lists
+        self.names = {zone.lower(): zone for zone in pytz.all_timezones}
+        keys = {}  # key -> set of zone names
+
+        def add(key, zone):
+            key = key.strip().lower()
+            if key:
+                keys.setdefault(key, set()).add(zone)
+
+        year = datetime.now().year
+        for zone in pytz.all_timezones:
+            add(zone, zone)
+            for part in zone.split("/"):
+                words = part.replace("_", " ")
+                add(words, zone)
+                for word in words.split():
+                    add(word, zone)
+            tz = pytz.timezone(zone)
+            for month in (1, 7):
+                try:
+                    add(tz.localize(datetime(year, month, 15)).tzname(), zone)
+                except Exception:
+                    pass
+
+        for code, zones in pytz.country_timezones.items():
+            name = pytz.country_names.get(code, "")
+            for zone in zones:
+                add(code, zone)
+                add(name, zone)
+                for word in name.replace(",", " ").split():
+                    add(word, zone)
+
+        self.keys = sorted(keys)
+        self.zones_by_key = [sorted(keys[k]) for k in self.keys]
+
+    def prefix(self, query):
+        found = {}
+        i = bisect_left(self.keys, query)
+        while i < len(self.keys) and self.keys[i].startswith(query):
+            exact = self.keys[i] == query
+            for zone in self.zones_by_key[i]:
+                if exact or zone not in found:
+                    found[zone] = exact
+            i += 1
+        return found
+
+    def search(self, query, limit=50):
+        query = query.strip().lower()
+        if not query:
+            # nothing typed: the whole common list, so it can be browsed
+            return list(self.common)
+        found = self.prefix(query)
+        if not found:
+            # fuzzy: closest keys by similarity, e.g. "newyork", "londn"
+            for key in difflib.get_close_matches(query, self.keys, n=10, cutoff=0.75):
+                for zone in self.zones_by_key[bisect_left(self.keys, key)]:
+                    found.setdefault(zone, False)
+        # exact key hits first, the usual zone for an abbreviation leading;
+        # then common zones before legacy ones, full-name prefixes first
+        preferred = PREFERRED.get(query)
+        results = sorted(found, key=lambda z: (not found[z], z != preferred, z not in self.primary,
+                                               not z.lower().startswith(query), z))
+        return results[:limit]
+
+    def resolve(self, text):
+        # the zone a typed string names, or None: a zone name, an
+        # abbreviation alias, or a key that leaves exactly one zone. No
+        # fuzzy guesses - "a" or "londn" must not pick a zone by themselves.
+        if text in pytz.all_timezones_set:
+            return text
+        query = text.strip().lower()
+        if not query:
+            return None
+        if query in PREFERRED:
+            return PREFERRED[query]
+        if query in self.names:
+            return self.names[query]
+        found = self.prefix(query)
+        exact = [z for z in found if found[z]]
+        candidates = exact or list(found)
+        if len(candidates) > 1:
+            # legacy aliases of one common zone don't make it ambiguous
+            candidates = [z for z in candidates if z in self.primary]
+        return candidates[0] if len(candidates) == 1 else None
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ZoneSearchIndex()
+        return _index
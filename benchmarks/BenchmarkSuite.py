@@ -0,0 +1,220 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Timing-accuracy and throughput benchmarks for the timer hot paths. Every
+# benchmark returns a flat dict of numbers; the suite writes them all to one
+# JSON file so runs can be compared between releases:
+#
+#     python benchmarks/BenchmarkSuite.py --output results.json
+#     python benchmarks/BenchmarkSuite.py --only config,zones
+
+
+def summarize(samples, scale=1000.0):
+    # mean/p50/p99/max of a list of seconds, reported in milliseconds
+    samples = sorted(samples)
+    if not samples:
+        return {}
+    return {
+        "count": len(samples),
+        "mean_ms": statistics.fmean(samples) * scale,
+        "p50_ms": samples[len(samples) // 2] * scale,
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * scale,
+        "max_ms": samples[-1] * scale,
+    }
+
+
+def bench_tick_drift(quick):
+    # real-time lateness of Timer ticks on the wheel driver, plus a simulated
+    # long run of the same deadline arithmetic
+    from TickDriftBenchmark import simulate_deadline
+    from TimerCore import Timer
+    from TimingWheel import ThreadWheelDriver
+
+    seconds = 3 if quick else 15
+    driver = ThreadWheelDriver()
+    lateness = []
+    done = threading.Event()
+    timer = Timer(seconds, driver)
+
+    def on_tick(left):
+        ideal = timer.deadline - left
+        lateness.append(time.monotonic() - ideal)
+
+    timer.on("tick", on_tick)
+    timer.on("finish", done.set)
+    timer.start()
+    done.wait(seconds + 5)
+    driver.stop()
+
+    drift, worst = simulate_deadline(1 if quick else 24, random.Random(1))
+    result = {"real_seconds": seconds, "simulated_drift_ms": drift * 1000,
+              "simulated_worst_edge_ms": worst * 1000}
+    # the first tick fires synchronously from start(); skip it
+    result.update({"lateness_" + k: v for k, v in summarize(lateness[1:]).items()})
+    if len(lateness) > 2:
+        result["jitter_stdev_ms"] = statistics.stdev(lateness[1:]) * 1000
+    return result
+
+
+def bench_sound_latency(quick):
+    # time from play_sound being called to Sound.play() returning, cold
+    # (decode) and warm (cache hit)
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    try:
+        import pygame
+    except ImportError:
+        return {"skipped": "pygame not installed"}
+    from SoundCache import SoundCache
+
+    pygame.mixer.init()
+    path = os.path.join(ROOT, "coin_ringing.wav")
+    cold, warm = [], []
+    for _ in range(3 if quick else 10):
+        cache = SoundCache()
+        start = time.perf_counter()
+        cache.get(path).play()
+        cold.append(time.perf_counter() - start)
+        for _ in range(20):
+            start = time.perf_counter()
+            cache.get(path).play()
+            warm.append(time.perf_counter() - start)
+    pygame.mixer.quit()
+    result = {"cold_" + k: v for k, v in summarize(cold).items()}
+    result.update({"warm_" + k: v for k, v in summarize(warm).items()})
+    return result
+
+
+def bench_config(quick):
+    # the old load_config/save_config pair against ConfigStore
+    from ConfigStore import ConfigStore
+
+    rounds = 50 if quick else 500
+    with open(os.path.join(ROOT, "timer_config.json")) as f:
+        seed = f.read()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "timer_config.json")
+        with open(path, "w") as f:
+            f.write(seed)
+
+        start = time.perf_counter()
+        for i in range(rounds):
+            with open(path) as f:
+                data = json.load(f)
+            data["volume"] = i / rounds
+            with open(path, "w") as f:
+                json.dump(data, f)
+        legacy = (time.perf_counter() - start) / rounds
+
+        start = time.perf_counter()
+        store = ConfigStore(path, delay=3600)
+        load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(rounds):
+            store.set("volume", i / rounds)
+        set_cost = (time.perf_counter() - start) / rounds
+
+        flushes = []
+        for i in range(20):
+            store.set("volume", i)
+            start = time.perf_counter()
+            store.flush()
+            flushes.append(time.perf_counter() - start)
+        store.close()
+        return {
+            "legacy_load_save_ms": legacy * 1000,
+            "store_load_ms": load * 1000,
+            "store_set_us": set_cost * 1e6,
+            "store_flush_mean_ms": statistics.fmean(flushes) * 1000,
+            "store_writes": store.writes,
+        }
+
+
+def bench_zones(quick):
+    # per-tick cost of formatting every clock as the number of zones grows
+    import pytz
+    from ZoneClock import ZoneClockTable
+
+    ticks = 20 if quick else 200
+    result = {}
+    now = int(time.time())
+    for count in (10, 50, 200, len(pytz.common_timezones)):
+        table = ZoneClockTable()
+        for name in pytz.common_timezones[:count]:
+            table.add(name)
+        start = time.perf_counter()
+        for tick in range(ticks):
+            table.time_strs(now + tick)
+        result[f"zones_{count}_tick_ms"] = (time.perf_counter() - start) / ticks * 1000
+    return result
+
+
+def bench_cold_start(quick):
+    # import time of TimerGUI.py in a fresh interpreter; with a display the
+    # startup mode also reports time to first paint
+    runs = 2 if quick else 5
+    imports = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import TimerGUI"], cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        imports.append(time.perf_counter() - start)
+    result = {"import_" + k: v for k, v in summarize(imports).items()}
+    if os.environ.get("DISPLAY") or os.name == "nt" or sys.platform == "darwin":
+        from StartupTime import startup_times
+        result["first_paint"] = startup_times(runs=runs)
+    return result
+
+
+BENCHMARKS = {
+    "tick_drift": bench_tick_drift,
+    "sound_latency": bench_sound_latency,
+    "config": bench_config,
+    "zones": bench_zones,
+    "cold_start": bench_cold_start,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Timer benchmark suite")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file to write")
+    parser.add_argument("--only", help="comma separated subset of: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--quick", action="store_true", help="shorter runs for a smoke check")
+    args = parser.parse_args(argv)
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    results = {}
+    for name in names:
+        print(f"running {name}...", flush=True)
+        try:
+            results[name] = BENCHMARKS[name](args.quick)
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+        print(json.dumps(results[name], indent=2))
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ScheduleDispatcher import NEAR_CHECK, ScheduleDispatcher
+
+# Wall-clock starts on a real ScheduleDispatcher whose wall clock is stepped
+# while they wait: no step, an NTP step forward (also what a suspend looks
+# like to a waiting thread), and a step back. Reports how far from its wall
+# clock target each start fired, and fails if it is further than LIMIT.
+# A step that jumps past the target can only be noticed, not anticipated:
+# it must fire within NEAR_CHECK of the step when the target was less than
+# wall_check away, and within wall_check otherwise.
+
+LIMIT = 0.020  # timer and scheduling slack on top of the dispatcher's bounds
+
+
+def run(step_at, step, target_in, wall_check=1.0):
+    skew = [0.0]
+    wall = lambda: time.time() + skew[0]
+    dispatcher = ScheduleDispatcher(wall_clock=wall, wall_check=wall_check)
+    fired = threading.Event()
+    result = {}
+
+    def fire():
+        result["error"] = wall() - target
+        result["at"] = time.monotonic()
+        fired.set()
+
+    target = wall() + target_in
+    dispatcher.schedule_wall(target, fire)
+    stepped = time.monotonic()
+    if step:
+        time.sleep(step_at)
+        stepped = time.monotonic()
+        skew[0] += step
+    fired.wait(target_in + abs(step) + 5)
+    dispatcher.stop()
+    return result.get("error"), result.get("at", stepped) - stepped, dispatcher.jumps
+
+
+if __name__ == "__main__":
+    wall_check = 1.0
+    # name, step at, step, target in, bound on the error (or, for a skipped
+    # target, on the time from the step to the firing)
+    cases = [
+        ("no step", 0, 0, 2.0, LIMIT),
+        ("step +2 s", 0.3, 2.0, 3.0, LIMIT),
+        ("step -2 s", 0.3, -2.0, 1.0, LIMIT),
+        ("step +0.5 s near the target", 0.5, 0.5, 1.2, NEAR_CHECK + LIMIT),
+        ("step +10 s near the target", 0.3, 10.0, 0.8, NEAR_CHECK + LIMIT),
+        ("step +10 s", 0.3, 10.0, 3.0, wall_check + LIMIT),
+    ]
+    errors = []
+    for name, step_at, step, target_in, bound in cases:
+        error, after_step, jumps = run(step_at, step, target_in, wall_check)
+        if error is None:
+            errors.append(f"{name}: never fired")
+            continue
+        skipped = step > 0 and step_at + step > target_in
+        if skipped:
+            print(f"{name:28s}: target skipped; fired {after_step * 1000:.1f} ms after the step ({jumps} jump(s) seen)")
+            off = after_step
+        else:
+            print(f"{name:28s}: fired {error * 1000:+.1f} ms from the wall-clock target ({jumps} jump(s) seen)")
+            off = abs(error)
+        if off > bound:
+            errors.append(f"{name}: {off * 1000:.1f} ms, over the {bound * 1000:.0f} ms bound")
+    for error in errors:
+        print(error)
+    print("OK" if not errors else "FAILED")
+    sys.exit(0 if not errors else 1)
@@ -0,0 +1,179 @@
+import argparse
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ControlServer import ControlServer
+from TimerControl import TimerController, parse_address
+from TimingWheel import TkWheelDriver
+
+# Load test for the control API. Several clients each create a set of timers,
+# then pipeline start / pause / resume / reschedule / stop commands (singly or
+# in batches) for a fixed time, keeping a window of requests in flight.
+# Reports commands per second, request latency, and the longest the "GUI"
+# thread was busy in one callback (how long a window would freeze).
+#
+# By default it runs against a local instance whose timers live on one
+# "GUI" thread with a Tk-style after() loop, as in the app. Point it at a
+# running app with --connect (TimerGUI.py --control ADDRESS) instead.
+
+OPS = ("start", "pause", "resume", "reschedule", "stop")
+
+
+class MainLoop:
+    # a single-threaded after() loop standing in for Tk's mainloop
+    def __init__(self):
+        self.heap = []
+        self.seq = itertools.count()
+        self.wakeup = threading.Condition()
+        self.running = True
+        self.callbacks = 0
+        self.longest = 0.0
+
+    def after(self, ms, callback):
+        with self.wakeup:
+            heapq.heappush(self.heap, (time.monotonic() + ms / 1000, next(self.seq), callback))
+            self.wakeup.notify()
+
+    def run(self):
+        while True:
+            with self.wakeup:
+                while self.running and (not self.heap or self.heap[0][0] > time.monotonic()):
+                    self.wakeup.wait(self.heap[0][0] - time.monotonic() if self.heap else None)
+                if not self.running:
+                    return
+                callback = heapq.heappop(self.heap)[2]
+            self.callbacks += 1
+            started = time.perf_counter()
+            callback()
+            self.longest = max(self.longest, time.perf_counter() - started)
+
+    def quit(self):
+        with self.wakeup:
+            self.running = False
+            self.wakeup.notify()
+
+
+def local_instance(address):
+    root = MainLoop()
+    threading.Thread(target=root.run, name="GUI", daemon=True).start()
+    controller = TimerController(TkWheelDriver(root))
+    server = ControlServer(controller, address, deliver=lambda fn: root.after(0, fn))
+    server.start()
+    return root, server
+
+
+async def client(address, number, timers, seconds, window, batch, latencies, counts):
+    if isinstance(address, str):
+        reader, writer = await asyncio.open_unix_connection(address, limit=1 << 20)
+    else:
+        reader, writer = await asyncio.open_connection(*address, limit=1 << 20)
+    names = [f"load-{number}-{i}" for i in range(timers)]
+    writer.write((json.dumps([{"op": "create", "name": n, "seconds": 300} for n in names]) + "\n").encode())
+    created = json.loads(await reader.readline())
+    if not all(r["ok"] for r in created):
+        raise RuntimeError(f"create failed: {created}")
+
+    sent = asyncio.Queue()
+    stop_at = time.monotonic() + seconds
+    commands = itertools.cycle([{"op": op, "name": n, "remaining": 100.0} for op in OPS for n in names])
+    in_flight = asyncio.Semaphore(window)
+
+    async def send():
+        while time.monotonic() < stop_at:
+            await in_flight.acquire()
+            request = [next(commands) for _ in range(batch)] if batch > 1 else next(commands)
+            writer.write((json.dumps(request) + "\n").encode())
+            await sent.put(time.perf_counter())
+            if sent.qsize() % 64 == 0:
+                await writer.drain()
+        await sent.put(None)
+
+    async def receive():
+        while True:
+            started = await sent.get()
+            if started is None:
+                return
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - started)
+            in_flight.release()
+            for result in response if isinstance(response, list) else [response]:
+                counts["ok" if result["ok"] else "failed"] += 1
+
+    await asyncio.gather(send(), receive())
+    writer.write((json.dumps([{"op": "remove", "name": n} for n in names]) + "\n").encode())
+    await reader.readline()
+    writer.close()
+
+
+async def load(address, clients, timers, seconds, window, batch):
+    latencies = []
+    counts = {"ok": 0, "failed": 0}
+    started = time.perf_counter()
+    await asyncio.gather(*(client(address, n, timers, seconds, window, batch, latencies, counts)
+                           for n in range(clients)))
+    return latencies, counts, time.perf_counter() - started
+
+
+def report(label, latencies, counts, elapsed, handoffs=None, longest=None):
+    latencies.sort()
+    rate = counts["ok"] / elapsed
+    line = (f"{label}: {counts['ok']:,} commands in {elapsed:.1f} s = {rate:,.0f}/s, "
+            f"request latency p50 {latencies[len(latencies) // 2] * 1000:.2f} ms, "
+            f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+    if handoffs:
+        line += f", {counts['ok'] / handoffs:.0f} commands per GUI callback"
+    if longest is not None:
+        line += f", longest GUI callback {longest * 1000:.1f} ms"
+    print(line)
+    return rate
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Control API load test")
+    parser.add_argument("--connect", metavar="ADDRESS", help="a running instance (port, host:port or socket path)")
+    parser.add_argument("--unix", action="store_true", help="local instance on a Unix socket instead of TCP")
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--timers", type=int, default=50, help="timers per client")
+    parser.add_argument("--seconds", type=float, default=2.0, help="per run")
+    parser.add_argument("--window", type=int, default=64, help="requests in flight per client")
+    args = parser.parse_args()
+
+    root = server = None
+    directory = tempfile.mkdtemp()
+    if args.connect:
+        address = parse_address(args.connect)
+    else:
+        root, server = local_instance(os.path.join(directory, "control.sock") if args.unix else ("127.0.0.1", 0))
+        address = server.address
+
+    rates = []
+    for batch in (1, 50):
+        handoffs = server.handoffs if server else None
+        if root is not None:
+            root.longest = 0.0
+        latencies, counts, elapsed = asyncio.run(
+            load(address, args.clients, args.timers, args.seconds, args.window, batch))
+        label = "single commands" if batch == 1 else f"batches of {batch}"
+        rates.append(report(label, latencies, counts, elapsed, server and server.handoffs - handoffs,
+                            root and root.longest))
+        if counts["failed"]:
+            print(f"{counts['failed']} commands failed")
+            rates[-1] = 0
+
+    if server is not None:
+        server.stop()
+        root.quit()
+    shutil.rmtree(directory, ignore_errors=True)
+    ok = min(rates) >= 1000
+    print("OK" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,59 @@
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TerminalDashboard import TerminalDashboard
+from TimeStrings import mmss
+
+# 500 countdowns ticking once a second on a 200x60 terminal: bytes and write
+# calls per frame for the dashboard against one "\r" print per timer.
+
+
+class CountingOut(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def run(timers=500, seconds=60, size=(200, 60)):
+    out = CountingOut()
+    dashboard = TerminalDashboard(out=out, size=size)
+    counts = {f"timer {i}": 600 + i * 7 for i in range(timers)}
+    for name, count in counts.items():
+        dashboard.set(name, mmss(count))
+    first = dashboard.render()
+
+    start = time.perf_counter()
+    frame_bytes = []
+    for second in range(1, seconds + 1):
+        for name, count in counts.items():
+            dashboard.set(name, mmss(max(0, count - second)))
+        frame_bytes.append(dashboard.render())
+    elapsed = time.perf_counter() - start
+    return first, frame_bytes, elapsed, out.writes
+
+
+def naive(timers=500, seconds=60):
+    out = CountingOut()
+    start = time.perf_counter()
+    for second in range(1, seconds + 1):
+        for i in range(timers):
+            out.write(f"\rcountdown: {600 + i * 7 - second}")
+            out.flush()
+    return out.tell() // seconds, time.perf_counter() - start, out.writes
+
+
+if __name__ == "__main__":
+    first, frames, elapsed, writes = run()
+    print(f"dashboard: first frame {first:,} B, then {sum(frames) // len(frames):,} B/frame, "
+          f"{writes} writes for {len(frames) + 1} frames, {elapsed / len(frames) * 1000:.2f} ms/frame")
+    per_second, elapsed, writes = naive()
+    print(f"print per timer: {per_second:,} B/s in {writes // 60} writes/s, "
+          f"{elapsed / 60 * 1000:.2f} ms/s (and only one line visible)")
@@ -0,0 +1,101 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Clock import VirtualClock
+from TimerCore import Timer, Schedule
+from TimingWheel import ThreadWheelDriver
+
+# Runs a scheduled start followed by a looping countdown for 24 simulated
+# hours on a VirtualClock, then checks the event sequence. A short run of the
+# same timer in real time must produce exactly the same events.
+
+
+def record(timer, schedule=None):
+    events = []
+    for name in ("start", "tick", "warning", "expire", "loop", "finish", "stop"):
+        timer.on(name, lambda *args, name=name: events.append((name,) + args))
+    if schedule is not None:
+        for name in ("scheduled", "fire", "cancel"):
+            schedule.on(name, lambda *args, name=name: events.append((name,) + args))
+    return events
+
+
+def simulate_day(delay=60, seconds=600, hours=24):
+    clock = VirtualClock()
+    schedule = Schedule(dispatcher=clock, clock=clock)
+    timer = Timer(seconds, clock, loop=True, clock=clock)
+    events = record(timer, schedule)
+    schedule.on("fire", timer.start)
+    schedule.start_in(delay)
+
+    start = time.perf_counter()
+    clock.advance(hours * 3600)
+    elapsed = time.perf_counter() - start
+    timer.stop()
+    return events, elapsed, clock.fired
+
+
+def check_day(events, delay=60, seconds=600, hours=24):
+    counts = {}
+    for event in events:
+        counts[event[0]] = counts.get(event[0], 0) + 1
+    # the countdown runs from `delay` to the end of the day and shows a new
+    # value on every whole second of it, both ends included
+    loops = (hours * 3600 - delay) // seconds
+    expected = {
+        "scheduled": 1,
+        "fire": 1,
+        "start": 1,
+        "expire": loops,
+        "loop": loops,
+        "tick": hours * 3600 - delay + 1,
+        "stop": 1,
+    }
+    errors = [f"{name}: expected {n}, got {counts.get(name, 0)}"
+              for name, n in expected.items() if counts.get(name, 0) != n]
+    # every loop counts down seconds, ..., 1 in order
+    ticks = [e[1] for e in events if e[0] == "tick"]
+    for i, left in enumerate(ticks):
+        if left != seconds - i % seconds:
+            errors.append(f"tick {i}: expected {seconds - i % seconds}, got {left}")
+            break
+    return errors
+
+
+def compare_real_time(seconds=3):
+    # the same short countdown on a real thread driver and on a VirtualClock
+    driver = ThreadWheelDriver()
+    done = threading.Event()
+    real = Timer(seconds, driver)
+    real_events = record(real)
+    real.on("finish", done.set)
+    real.start()
+    done.wait(seconds + 5)
+    driver.stop()
+
+    clock = VirtualClock()
+    virtual = Timer(seconds, clock, clock=clock)
+    virtual_events = record(virtual)
+    virtual.start()
+    clock.advance(seconds + 1)
+    return real_events, virtual_events
+
+
+if __name__ == "__main__":
+    events, elapsed, fired = simulate_day()
+    errors = check_day(events)
+    print(f"24 h simulated in {elapsed * 1000:.1f} ms: {len(events)} events, {fired} callbacks")
+    for error in errors:
+        print("  MISMATCH", error)
+
+    real_events, virtual_events = compare_real_time()
+    same = real_events == virtual_events
+    print(f"real-time vs virtual 3 s countdown: {'identical' if same else 'DIFFERENT'}")
+    if not same:
+        print("  real:   ", real_events)
+        print("  virtual:", virtual_events)
+    sys.exit(1 if errors or not same else 0)
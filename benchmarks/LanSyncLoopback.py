@@ -0,0 +1,105 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from LanSync import LanSync, PACKET
+from TimerCore import Timer
+from TimingWheel import ThreadWheelDriver, TimingWheel
+
+# One authority and several followers over multicast on the loopback
+# interface, each follower on a clock skewed by a known amount as if it were
+# another machine. The authority starts, pauses, resumes and stops a timer;
+# after each step every follower must be in the same state with its deadline
+# (or time left) within 10 ms of the authority's, once the skew is taken out.
+
+PORT = 50199
+SKEWS = (3.7, -12.25, 0.0004, 86400.0)
+LIMIT = 0.010
+
+
+class SkewedClock:
+    def __init__(self, skew):
+        self.skew = skew
+
+    def monotonic(self):
+        return time.monotonic() + self.skew
+
+    def time(self):
+        return time.time() + self.skew
+
+
+def instance(role, skew=0.0):
+    clock = SkewedClock(skew)
+    driver = ThreadWheelDriver(wheel=TimingWheel(clock=clock.monotonic))
+    sync = LanSync(role, port=PORT, interface="127.0.0.1", clock=clock)
+    timer = Timer(30, driver, clock=clock)
+    return sync, timer
+
+
+def check(step, authority_timer, followers):
+    errors = []
+    worst = 0.0
+    for skew, sync, timer in followers:
+        if timer.running != authority_timer.running or timer.paused != authority_timer.paused:
+            errors.append(f"{step}: follower {skew:+} running={timer.running} paused={timer.paused}")
+            continue
+        if timer.running:
+            error = abs(timer.deadline - skew - authority_timer.deadline)
+        elif timer.paused:
+            error = abs(timer.remaining - authority_timer.remaining)
+        else:
+            continue
+        worst = max(worst, error)
+        if error > LIMIT:
+            errors.append(f"{step}: follower {skew:+} off by {error * 1000:.2f} ms")
+    print(f"{step}: worst follower error {worst * 1000:.3f} ms")
+    return errors
+
+
+if __name__ == "__main__":
+    authority, authority_timer = instance("authority")
+    followers = []
+    for skew in SKEWS:
+        sync, timer = instance("follower", skew)
+        sync.follow("Station 1", timer)
+        followers.append((skew, sync, timer))
+    for _, sync, _ in followers:
+        sync.start()
+    authority.start()
+    authority.publish("Station 1", authority_timer)
+    began = time.monotonic()
+
+    errors = []
+    authority_timer.start()
+    time.sleep(1.5)
+    errors += check("start", authority_timer, followers)
+    authority_timer.pause()
+    time.sleep(0.3)
+    errors += check("pause", authority_timer, followers)
+    authority_timer.resume()
+    time.sleep(0.3)
+    errors += check("resume", authority_timer, followers)
+    time.sleep(2.0)
+    errors += check("steady", authority_timer, followers)
+    authority_timer.stop()
+    time.sleep(0.3)
+    errors += check("stop", authority_timer, followers)
+    elapsed = time.monotonic() - began
+
+    for skew, sync, _ in followers:
+        stats = sync.stats()
+        offset_error = abs(stats["offset"] + skew) if stats["offset"] is not None else float("nan")
+        print(f"follower {skew:+}: offset error {offset_error * 1e6:.1f} us, "
+              f"best round trip {stats['delay'] * 1e6:.1f} us, {stats['sent']} pings")
+    print(f"authority: {authority.sent} packets of {PACKET.size} bytes in {elapsed:.1f} s "
+          f"({authority.sent * PACKET.size / elapsed:.0f} B/s for one timer)")
+
+    authority.stop()
+    for _, sync, _ in followers:
+        sync.stop()
+    for error in errors:
+        print(error)
+    print("OK" if not errors else "FAILED")
+    sys.exit(0 if not errors else 1)
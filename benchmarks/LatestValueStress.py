@@ -0,0 +1,83 @@
+import os
+import queue
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from LatestValue import LatestValue
+
+# Fast producer, slow consumer: the producer puts a counter as fast as it can
+# while the consumer takes a value every few milliseconds. Checks that the
+# LatestValue channel stays one slot, that the consumer only ever sees
+# increasing values, and how stale each value was when taken. Runs the old
+# queue.Queue pipeline alongside for comparison.
+
+
+def stress(channel, seconds=2.0, consumer_delay=0.005):
+    produced = [0]
+    stop = threading.Event()
+    taken = []
+    staleness = []
+
+    def producer():
+        n = 0
+        while not stop.is_set():
+            n += 1
+            produced[0] = n
+            channel.put(n)
+
+    def consumer():
+        while not stop.is_set():
+            value = channel.get(timeout=0.1)
+            if value is None:
+                continue
+            # how many newer values existed by the time this one was taken
+            staleness.append(produced[0] - value)
+            taken.append(value)
+            time.sleep(consumer_delay)
+
+    tracemalloc.start()
+    threads = [threading.Thread(target=producer), threading.Thread(target=consumer)]
+    for t in threads:
+        t.start()
+    peaks = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        time.sleep(seconds / 10)
+        peaks.append(tracemalloc.get_traced_memory()[0])
+    stop.set()
+    if isinstance(channel, LatestValue):
+        channel.close()
+    for t in threads:
+        t.join()
+    tracemalloc.stop()
+
+    ordered = all(a < b for a, b in zip(taken, taken[1:]))
+    staleness.sort()
+    return {
+        "produced": produced[0],
+        "taken": len(taken),
+        "increasing": ordered,
+        "median_staleness": staleness[len(staleness) // 2] if staleness else None,
+        "memory_first_kb": peaks[0] / 1024,
+        "memory_last_kb": peaks[-1] / 1024,
+    }
+
+
+def report(name, result):
+    print(f"{name}: produced {result['produced']:,}, taken {result['taken']:,}, "
+          f"increasing={result['increasing']}, median staleness {result['median_staleness']:,} values, "
+          f"traced memory {result['memory_first_kb']:,.0f} KB -> {result['memory_last_kb']:,.0f} KB")
+
+
+if __name__ == "__main__":
+    latest = stress(LatestValue())
+    report("LatestValue", latest)
+    report("queue.Queue", stress(queue.Queue()))
+    # one slot: memory must not grow with the backlog
+    ok = latest["increasing"] and latest["memory_last_kb"] < latest["memory_first_kb"] + 64
+    print("OK" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
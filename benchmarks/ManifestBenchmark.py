@@ -0,0 +1,78 @@
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Clock import VirtualClock
+from ConfigStore import ConfigStore
+from TimerCore import Timer, TimerGroup
+from TimerManifest import load_manifest, apply_manifest
+
+# Loads a 1,000-timer manifest (JSON and CSV) into a ConfigStore: one parse,
+# one batch update, one file write. Then starts 1,000 timers as one group on
+# a VirtualClock and checks that every display changes on the same instants.
+
+COUNT = 1000
+
+
+def make_entries(count):
+    entries = []
+    for i in range(count):
+        entry = {"name": f"Station {i}", "duration": f"{1 + i % 10}:00", "loop": i % 2 == 0,
+                 "sound": "coin_ringing.wav"}
+        if i % 4 == 0:
+            entry.update({"schedule": f"{6 + i % 12:02d}:{i % 60:02d}", "days": "mon-fri",
+                          "exclude": "2026-12-25"})
+        elif i % 4 == 1:
+            entry["schedule"] = "every 15m"
+        entries.append(entry)
+    return entries
+
+
+def load(path, tmp):
+    store = ConfigStore(os.path.join(tmp, f"config_{os.path.basename(path)}.json"), delay=3600)
+    start = time.perf_counter()
+    timers = load_manifest(path)
+    parsed = time.perf_counter()
+    changed = apply_manifest(store, timers)
+    store.flush()
+    done = time.perf_counter()
+    store.close()
+    return len(timers), changed, (parsed - start) * 1000, (done - parsed) * 1000, store.writes
+
+
+def group_flips(count):
+    clock = VirtualClock()
+    group = TimerGroup(clock=clock)
+    flips = {}
+    for i in range(count):
+        timer = group.add(Timer(60, clock, clock=clock))
+        timer.on("tick", lambda left: flips.setdefault(left, set()).add(clock.monotonic()))
+    clock.advance(0.37)  # start off a whole second
+    group.start()
+    clock.advance(61)
+    # each displayed value appears at exactly one instant across all timers
+    return all(len(instants) == 1 for instants in flips.values()), len(flips)
+
+
+if __name__ == "__main__":
+    entries = make_entries(COUNT)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "timers.json")
+        with open(json_path, "w") as f:
+            json.dump(entries, f)
+        csv_path = os.path.join(tmp, "timers.csv")
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, ["name", "duration", "loop", "sound", "schedule", "days", "exclude"])
+            writer.writeheader()
+            writer.writerows(entries)
+        for path in (json_path, csv_path):
+            count, changed, parse_ms, apply_ms, writes = load(path, tmp)
+            print(f"{os.path.basename(path)}: {count} timers parsed and checked in {parse_ms:.0f} ms, "
+                  f"{changed} settings applied and saved in {apply_ms:.0f} ms with {writes} file write(s)")
+    same, values = group_flips(COUNT)
+    print(f"group of {COUNT}: {values} displayed values, each shown by every timer at one instant: {same}")
@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from LabelRenderer import LabelRenderer
+from TimeStrings import hhmmss
+
+# Tk calls per second for a wall of clock labels, with and without the
+# change-only render layer. Labels are refreshed every round (as a 100 ms
+# poll would) but their text only changes every tenth round.
+
+LABELS = 200
+ROUNDS = 200
+CHANGE_EVERY = 10
+
+
+def run(root, labels, renderer):
+    calls = 0
+    start = time.perf_counter()
+    for round_no in range(ROUNDS):
+        text = hhmmss((round_no // CHANGE_EVERY) % 86400)
+        for label in labels:
+            if renderer is None:
+                label.configure(text=text)
+                calls += 1
+            elif renderer.render(label, text=text):
+                calls += 1
+        root.update_idletasks()
+    return calls, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"needs a display: {e}")
+    labels = [tk.Label(root, text="") for _ in range(LABELS)]
+    for i, label in enumerate(labels):
+        label.grid(row=i // 10, column=i % 10)
+    root.update()
+
+    for name, renderer in (("direct configure", None), ("LabelRenderer", LabelRenderer())):
+        calls, elapsed = run(root, labels, renderer)
+        print(f"{name:>17}: {calls:6d} configure calls, {calls / elapsed:10.0f} calls/s, "
+              f"{elapsed / ROUNDS * 1000:.3f} ms per round")
+    root.destroy()
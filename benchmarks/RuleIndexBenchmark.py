@@ -0,0 +1,67 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ScheduleRules import IntervalRule, RuleIndex, parse_rule
+
+# Thousands of mixed recurring rules (daily with weekdays, intervals, cron)
+# in one RuleIndex, run through two simulated days: cost to build the index,
+# per firing, and to find the earliest next firing - against scanning every
+# rule's next firing, as separate per-rule timers would need.
+
+
+def make_rules(count, rng):
+    rules = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            days = rng.choice(["", " mon-fri", " sat,sun", " tue,thu"])
+            rules.append(parse_rule(f"{rng.randrange(24):02d}:{rng.randrange(60):02d}{days}",
+                                    exclude=["2026-12-25"]))
+        elif kind == 1:
+            rules.append(IntervalRule(rng.choice([5, 10, 15, 30, 60, 120]) * 60, anchor=rng.randrange(3600)))
+        else:
+            rules.append(parse_rule(f"{rng.randrange(60)} */{rng.choice([1, 2, 3, 6])} * * 1-5"))
+    return rules
+
+
+def run(rules, start, hours):
+    index = RuleIndex()
+    t0 = time.perf_counter()
+    for rule in rules:
+        index.add(rule, after=start)
+    build = time.perf_counter() - t0
+
+    fires = 0
+    t0 = time.perf_counter()
+    end = start + hours * 3600
+    while True:
+        fire = index.next_fire()
+        if fire is None or fire > end:
+            break
+        fires += len(index.pop_due(fire))
+    per_fire = (time.perf_counter() - t0) / fires
+
+    # earliest-firing lookup: heap peek against a scan of every rule
+    nexts = [rule.next_fire(end) for rule in rules]
+    t0 = time.perf_counter()
+    for _ in range(1000):
+        index.next_fire()
+    peek = (time.perf_counter() - t0) / 1000
+    t0 = time.perf_counter()
+    for _ in range(100):
+        min(nexts)
+    scan = (time.perf_counter() - t0) / 100
+    return build, fires, per_fire, peek, scan
+
+
+if __name__ == "__main__":
+    start = time.mktime((2026, 12, 24, 0, 0, 0, 0, 0, -1))
+    for count in (1000, 10000):
+        build, fires, per_fire, peek, scan = run(make_rules(count, random.Random(count)), start, 48)
+        print(f"{count:6d} rules: build {build * 1000:.0f} ms, {fires:,} firings in 48 h at "
+              f"{per_fire * 1e6:.1f} us each; next firing: index {peek * 1e6:.2f} us, "
+              f"scan {scan * 1e6:.0f} us")
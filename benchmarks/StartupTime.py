@@ -0,0 +1,73 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Time to first paint of the timer window, for the plain script and for the
+# PyInstaller build (see Readme). Each run launches the app with
+# --startup-time, which paints the first window, writes a JSON report and
+# exits. "process" is measured from launch here, so it includes interpreter
+# start-up and, for the frozen build, unpacking; "in_app" is measured from the
+# first line of TimerGUI.py.
+#
+#     python benchmarks/StartupTime.py
+#     python benchmarks/StartupTime.py --frozen dist/TimerGUI/TimerGUI
+#
+# Needs a display.
+
+DEFAULT_FROZEN = os.path.join(ROOT, "dist", "TimerGUI", "TimerGUI" + (".exe" if os.name == "nt" else ""))
+
+
+def measure(command, runs=5, timeout=60):
+    process_ms, in_app_ms = [], []
+    report = None
+    for _ in range(runs):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            launched = time.time()
+            subprocess.run(command + ["--startup-time", path], cwd=ROOT, timeout=timeout,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if os.path.getsize(path) == 0:
+                return {"error": "no report written (no display?)"}
+            with open(path) as f:
+                report = json.load(f)
+        except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+            return {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            os.remove(path)
+        process_ms.append((report["first_paint_epoch"] - launched) * 1000)
+        in_app_ms.append(report["first_paint_ms"])
+    return {
+        "runs": runs,
+        "process_median_ms": statistics.median(process_ms),
+        "process_min_ms": min(process_ms),
+        "in_app_median_ms": statistics.median(in_app_ms),
+        "frozen": report["frozen"],
+        "pygame_loaded_at_paint": report["pygame_loaded"],
+        "pytz_loaded_at_paint": report["pytz_loaded"],
+    }
+
+
+def startup_times(frozen=None, runs=5):
+    results = {"script": measure([sys.executable, os.path.join(ROOT, "TimerGUI.py")], runs)}
+    frozen = frozen or DEFAULT_FROZEN
+    if os.path.exists(frozen):
+        results["frozen"] = measure([frozen], runs)
+    else:
+        results["frozen"] = {"skipped": f"{frozen} not built"}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time to first paint")
+    parser.add_argument("--frozen", help="path to the PyInstaller executable")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(startup_times(args.frozen, args.runs), indent=2))
@@ -0,0 +1,92 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Clock import VirtualClock
+from TimerCore import Timer
+
+# Simulates a looped countdown for several hours with random callback latency
+# (what Tk's after() adds on a busy machine) and reports how far the displayed
+# second edges end up from the ideal edges. The deadline engine is the real
+# TimerCore.Timer, run on a VirtualClock.
+
+HOURS = 24
+PERIOD = 3600          # one 60-minute loop
+MAX_LATENCY = 0.020    # up to 20 ms late per callback
+
+
+def simulate_decrement(hours, rng):
+    # the original engine: decrement a counter and re-arm after(1000)
+    now = 0.0
+    shown = 0
+    worst = 0.0
+    while now < hours * 3600:
+        shown += 1
+        worst = max(worst, abs(now - (shown - 1)))
+        now += 1.0 + rng.uniform(0, MAX_LATENCY)
+    return worst
+
+
+class LateScheduler:
+    # a VirtualClock scheduler whose callbacks run a random 0-MAX_LATENCY
+    # late, the way Tk's after() does on a busy machine
+    def __init__(self, clock, rng):
+        self.clock = clock
+        self.rng = rng
+        self.latency = 0.0  # how late the running callback was called
+
+    def call_at(self, deadline, callback, *args):
+        latency = self.rng.uniform(0, MAX_LATENCY)
+        return self.clock.call_at(deadline + latency, self._late, latency, callback, args)
+
+    def _late(self, latency, callback, args):
+        self.latency = latency
+        callback(*args)
+
+    def cancel(self, handle):
+        return self.clock.cancel(handle)
+
+
+def simulate_deadline(hours, rng):
+    # the shipped engine: a looping TimerCore.Timer on a VirtualClock, each
+    # tick delivered late. Returns the worst drift of the requested wake-up
+    # from the ideal edge, the worst display error including the latency, and
+    # the number of displayed values that were skipped or repeated.
+    clock = VirtualClock()
+    scheduler = LateScheduler(clock, rng)
+    timer = Timer(PERIOD, scheduler, loop=True, clock=clock)
+    state = {"drift": 0.0, "worst": 0.0, "last": None, "skipped": 0, "ticks": 0}
+
+    def on_tick(left):
+        error = clock.monotonic() - (timer.deadline - left)
+        state["worst"] = max(state["worst"], abs(error))
+        state["drift"] = max(state["drift"], abs(error - scheduler.latency))
+        last = state["last"]
+        if last is not None and left != last - 1 and not (last == 1 and left == PERIOD):
+            state["skipped"] += 1
+        state["last"] = left
+        state["ticks"] += 1
+
+    timer.on("tick", on_tick)
+    timer.start()
+    clock.advance(hours * 3600)
+    timer.stop()
+    return state["drift"], state["worst"], state["skipped"], state["ticks"]
+
+
+if __name__ == "__main__":
+    rng = random.Random(1)
+    decrement = simulate_decrement(HOURS, rng)
+    drift, worst, skipped, ticks = simulate_deadline(HOURS, rng)
+    print(f"simulated {HOURS} h, callback latency 0-{MAX_LATENCY * 1000:.0f} ms")
+    print(f"decrement engine: worst edge error {decrement:9.3f} s")
+    print(f"deadline engine:  worst drift      {drift * 1000:9.3f} ms")
+    print(f"deadline engine:  worst edge error {worst * 1000:9.3f} ms (incl. latency)")
+    print(f"deadline engine:  {ticks:,} ticks, skipped or repeated seconds {skipped}")
+    # error must stay bounded by one callback's latency, not grow with runtime
+    assert drift < 0.002, drift
+    assert worst <= MAX_LATENCY + 0.002, worst
+    assert skipped == 0, skipped
+    assert ticks >= HOURS * 3600, ticks
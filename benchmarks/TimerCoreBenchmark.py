@@ -0,0 +1,59 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Clock import VirtualClock
+from TimerCore import Timer
+from TimingWheel import TimingWheel
+
+# Headless engine throughput: N looping core Timers with staggered starts on
+# one TimingWheel, stepped through simulated time without a display.
+
+TICK = 0.01
+SECONDS = 5
+
+
+def run(count, rng):
+    clock = VirtualClock()
+    wheel = TimingWheel(tick=TICK, clock=clock.monotonic)
+    events = [0]
+
+    def count_event(*args):
+        events[0] += 1
+
+    timers = []
+    for i in range(count):
+        timer = Timer(rng.randint(2, 60), wheel, loop=True, clock=clock)
+        timer.on("tick", count_event)
+        timer.on("expire", count_event)
+        timers.append(timer)
+
+    start = time.process_time()
+    for timer in timers:
+        # spread start times across one second so edges do not all coincide
+        timer.start(now=rng.uniform(0, 1.0))
+    start_us = (time.process_time() - start) / count * 1e6
+
+    start = time.process_time()
+    steps = int(SECONDS / TICK)
+    for step in range(1, steps + 1):
+        clock.run_until(step * TICK)
+        wheel.advance()
+    elapsed = time.process_time() - start
+    return {
+        "timers": count,
+        "start_us": start_us,
+        "tick_mean_ms": elapsed / steps * 1000,
+        "events_per_s": events[0] / elapsed,
+    }
+
+
+if __name__ == "__main__":
+    rng = random.Random(4)
+    for count in (1_000, 10_000, 100_000):
+        r = run(count, rng)
+        print(f"{r['timers']:>7} timers: start {r['start_us']:.2f} us/timer, "
+              f"{r['tick_mean_ms']:.3f} ms per 10 ms tick, {r['events_per_s']:,.0f} events/s")
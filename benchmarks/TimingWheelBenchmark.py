@@ -0,0 +1,64 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TimingWheel import TimingWheel
+
+# Per-tick CPU cost of driving N active countdowns from one TimingWheel.
+# Every countdown re-arms on its next whole-second edge, as CountdownTimer
+# does, and edges are spread across the second so each 10 ms tick fires a
+# batch of roughly N/100 callbacks.
+
+TICK = 0.01
+SECONDS = 3
+
+
+def run(active, rng):
+    now = [0.0]
+    wheel = TimingWheel(tick=TICK, clock=lambda: now[0])
+
+    def on_tick(deadline):
+        wheel.schedule_at(deadline + 1.0, on_tick, deadline + 1.0)
+
+    start = time.process_time()
+    handles = []
+    for _ in range(active):
+        deadline = rng.uniform(0, 1.0)
+        handles.append(wheel.schedule_at(deadline, on_tick, deadline))
+    insert_us = (time.process_time() - start) / active * 1e6
+
+    costs = []
+    for step in range(1, int(SECONDS / TICK) + 1):
+        now[0] = step * TICK
+        start = time.process_time()
+        wheel.advance()
+        costs.append(time.process_time() - start)
+
+    # cancel a fresh batch so the measured handles are all still pending
+    extra = [wheel.schedule(rng.uniform(1, 3600), on_tick, 0) for _ in range(active)]
+    start = time.process_time()
+    for handle in extra:
+        wheel.cancel(handle)
+    cancel_us = (time.process_time() - start) / active * 1e6
+
+    costs.sort()
+    return {
+        "active": active,
+        "insert_us": insert_us,
+        "cancel_us": cancel_us,
+        "tick_mean_ms": sum(costs) / len(costs) * 1000,
+        "tick_p99_ms": costs[int(len(costs) * 0.99) - 1] * 1000,
+        "fired_per_tick": active / (1.0 / TICK),
+    }
+
+
+if __name__ == "__main__":
+    rng = random.Random(2)
+    print(f"{'active':>8} {'insert us':>10} {'cancel us':>10} {'tick mean ms':>13} {'tick p99 ms':>12} {'fired/tick':>11}")
+    for active in (10_000, 100_000):
+        r = run(active, rng)
+        print(f"{r['active']:>8} {r['insert_us']:>10.2f} {r['cancel_us']:>10.2f} "
+              f"{r['tick_mean_ms']:>13.3f} {r['tick_p99_ms']:>12.3f} {r['fired_per_tick']:>11.0f}")
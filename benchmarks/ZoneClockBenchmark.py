@@ -0,0 +1,44 @@
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytz
+from ZoneClock import ZoneClockTable
+
+# Cost of formatting one tick of a wall of zone clocks, old way (resolve the
+# zone, astimezone, strftime on every tick) against the cached offset table.
+
+ZONES = 200
+TICKS = 200
+
+
+def old_tick(names):
+    now_utc = datetime.now(timezone.utc)
+    return [now_utc.astimezone(pytz.timezone(name)).strftime("%H:%M:%S") for name in names]
+
+
+def new_tick(table, now):
+    return [table.time_str(name, now) for name in table.zones]
+
+
+if __name__ == "__main__":
+    names = pytz.common_timezones[:ZONES]
+    table = ZoneClockTable()
+    for name in names:
+        table.add(name)
+
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        old_tick(names)
+    old_ms = (time.perf_counter() - start) / TICKS * 1000
+
+    now = int(time.time())
+    start = time.perf_counter()
+    for tick in range(TICKS):
+        new_tick(table, now + tick)
+    new_ms = (time.perf_counter() - start) / TICKS * 1000
+
+    print(f"{len(names)} zones, per tick: astimezone+strftime {old_ms:.3f} ms, cached table {new_ms:.3f} ms")